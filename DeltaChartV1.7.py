@@ -7,6 +7,7 @@ import win32api
 import time
 import os
 import sys
+from collections import OrderedDict
 
 # Settings Area------------------------------------------------------------------------------------------------------------
 background = (0, 0, 0)
@@ -89,20 +90,115 @@ def move_window(x, y):
     hwnd = pygame.display.get_wm_info()['window']
     win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, x, y, 0, 0, win32con.SWP_NOSIZE)
 
+# Font and text caches, fonts load once and recurring labels render once
+TEXT_CACHE_SIZE = 256
+fonts = {}
+text_cache = OrderedDict()
+text_cache_hits = 0
+text_cache_misses = 0
+text_cache_bytes = 0
+
+def get_font(size, face=None):
+    """ Load each (face, size) font once. """
+    key = (face, size)
+    if key not in fonts:
+        fonts[key] = pygame.font.Font(face, size)
+    return fonts[key]
+
+def render_text(text, size, color, antialias=True, face=None):
+    """ Render text through an LRU cache, the returned surface is shared so only blit it. """
+    global text_cache_hits, text_cache_misses, text_cache_bytes
+    key = (text, face, size, color, antialias)
+    text_surf = text_cache.get(key)
+    if text_surf is not None:
+        text_cache.move_to_end(key)
+        text_cache_hits += 1
+        return text_surf
+    text_cache_misses += 1
+    text_surf = get_font(size, face).render(text, antialias, color)
+    text_cache[key] = text_surf
+    text_cache_bytes += text_surf.get_pitch() * text_surf.get_height()
+    if len(text_cache) > TEXT_CACHE_SIZE:
+        _, oldest = text_cache.popitem(last=False)
+        text_cache_bytes -= oldest.get_pitch() * oldest.get_height()
+    return text_surf
+
+def text_cache_stats():
+    """ Hit rate and memory of the text cache, for tuning TEXT_CACHE_SIZE. """
+    lookups = text_cache_hits + text_cache_misses
+    return {
+        'entries': len(text_cache),
+        'fonts': len(fonts),
+        'hits': text_cache_hits,
+        'misses': text_cache_misses,
+        'hit_rate': text_cache_hits / lookups if lookups else 0.0,
+        'bytes': text_cache_bytes,
+    }
+
 def draw_button(surface, rect, text):
     """ Draw a button on the screen. """
-    pygame.draw.rect(surface, (0, 0, 255), rect)  # Blue background
+    drawn = pygame.draw.rect(surface, (0, 0, 255), rect)  # Blue background
     pygame.draw.rect(surface, (255, 255, 255), rect, 2)  # White border
-    font = pygame.font.Font(None, 20)  # Smaller font size for the button text
-    text_surf = font.render(text, True, (255, 255, 255))
+    text_surf = render_text(text, 20, (255, 255, 255))  # Smaller font size for the button text
     text_rect = text_surf.get_rect(center=rect.center)
-    surface.blit(text_surf, text_rect)
+    return drawn.union(surface.blit(text_surf, text_rect))
 
 def is_point_in_rect(point, rect):
     """ Check if a point is inside a rectangle. """
     x, y = point
     return rect.left <= x <= rect.right and rect.top <= y <= rect.bottom
 
+# Dirty rectangle rendering, widgets are only repainted when what they show changed
+widget_frames = {}  # name -> (state, rect) as drawn last frame
+
+def merge_rects(rects):
+    """ Union overlapping rects, so no area is repainted twice. """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i >= 0:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+def draw_widgets(surface, layer, widgets, full_redraw=False):
+    """ Draw widgets that changed since last frame and return the rects to pass to pygame.display.update.
+    layer is the static background the widgets are drawn on, see build_background_layer.
+    widgets is a list of (name, state, rect, draw) from back to front, state is anything that changes when the
+    widget would look different, rect is the area it covers worked out from the layout and draw(surface) draws it. """
+    if full_redraw:
+        widget_frames.clear()
+        surface.blit(layer, (0, 0))
+        for name, state, rect, draw in widgets:
+            widget_frames[name] = (state, rect)
+            draw(surface)
+        return [surface.get_rect()]
+
+    dirty_rects = []
+    for name, state, rect, draw in widgets:
+        if name in widget_frames:
+            if widget_frames[name][0] == state:
+                continue
+            dirty_rects.append(widget_frames[name][1])
+        widget_frames[name] = (state, rect)
+        dirty_rects.append(rect)
+    if not dirty_rects:
+        return []
+
+    # Widgets can hang off the window after a drag, only repaint what is on it
+    screen_rect = surface.get_rect()
+    dirty_rects = [rect for rect in (rect.clip(screen_rect) for rect in merge_rects(dirty_rects)) if rect]
+    for dirty_rect in dirty_rects:
+        surface.set_clip(dirty_rect)
+        surface.blit(layer, dirty_rect, dirty_rect)
+        for name, state, rect, draw in widgets:
+            if rect.colliderect(dirty_rect):
+                draw(surface)
+    surface.set_clip(None)
+    return dirty_rects
+
 def draw_delta_bar(surface, rect, value):
     """ Draw a delta bar on the screen. """
     max_bar_width = rect.width // 2
@@ -120,7 +216,15 @@ def draw_delta_bar(surface, rect, value):
         bar_rect = pygame.Rect(rect.x + max_bar_width - bar_width, rect.y, bar_width, rect.height)
         color = (255, 0, 0)
 
-    pygame.draw.rect(surface, color, bar_rect)
+    return pygame.draw.rect(surface, color, bar_rect)
+
+def build_background_layer(size, button_rect):
+    """ Render everything that does not change between frames once, it is blitted under the widgets
+    and only rebuilt when the layout changes. """
+    layer = pygame.Surface(size)
+    layer.fill(background)
+    draw_button(layer, button_rect, "TB")
+    return layer
 
 # Set up the display with NOFRAME flag for a borderless window initially
 screen_width, screen_height = 500, 250
@@ -151,10 +255,19 @@ flash_duration = 1.2  # Flash duration in seconds
 flash_color = (255, 0, 187)  # Violet color
 original_color = (174, 255, 0)  # Green color
 
+# Repaint everything on the first frame, after a resize and after the window was recreated
+full_redraw = True
+last_screen_size = None
+background_layer = None
+background_layout = None
+
 # Main loop
 running = True
 while running:
     screen_width, screen_height = pygame.display.get_surface().get_size()
+    if (screen_width, screen_height) != last_screen_size:
+        last_screen_size = (screen_width, screen_height)
+        full_redraw = True
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -167,9 +280,9 @@ while running:
                 if is_point_in_rect(event.pos, button_rect):
                     borderless = not borderless
                     set_window_mode(borderless)
-
-    # Clear the screen with a transparent color
-    screen.fill(background)  # No alpha needed here, just solid color for background 0,0,0 if you want clear.
+                    full_redraw = True
+        elif event.type == pygame.WINDOWEXPOSED:
+            full_redraw = True
 
     # Fetch the latest data
     try:
@@ -196,26 +309,40 @@ while running:
         flash_start_time = None  # Reset flash state
 
     # Render the data
-    font = pygame.font.Font(None, 36)
-    
     # Calculate the position for centered text
-    lap_delta_text = font.render(f"Lap Delta to Best Lap: {lap_delta_to_best_lap:.2f}", True, original_color)  # Green for delta to best lap
+    lap_delta_text = render_text(f"Lap Delta to Best Lap: {lap_delta_to_best_lap:.2f}", 36, original_color)  # Green for delta to best lap
     lap_delta_text_rect = lap_delta_text.get_rect(center=(screen_width // 2, 50))
-    screen.blit(lap_delta_text, lap_delta_text_rect.topleft)
 
-    session_last_lap_text = font.render(f"Lap Delta to Last Lap: {lap_delta_to_session_last_lap:.2f}", True, session_last_lap_color)  # Green for delta to last lap
+    session_last_lap_text = render_text(f"Lap Delta to Last Lap: {lap_delta_to_session_last_lap:.2f}", 36, session_last_lap_color)  # Green for delta to last lap
     session_last_lap_text_rect = session_last_lap_text.get_rect(center=(screen_width // 2, 150))
-    screen.blit(session_last_lap_text, session_last_lap_text_rect.topleft)
-
-    # Draw the delta bars
-    draw_delta_bar(screen, pygame.Rect(screen_width // 2 - 100, 80, 200, 20), lap_delta_to_best_lap)
-    draw_delta_bar(screen, pygame.Rect(screen_width // 2 - 100, 180, 200, 20), lap_delta_to_session_last_lap)
-
-    # Draw the button
-    draw_button(screen, button_rect, "TB")
 
-    # Update the display
-    pygame.display.flip()
+    # Rebuild the static background on resize or window mode toggle
+    layout = (screen_width, screen_height, borderless, background, tuple(button_rect))
+    if layout != background_layout:
+        background_layout = layout
+        background_layer = build_background_layer((screen_width, screen_height), button_rect)
+        full_redraw = True
+
+    # Each widget with what it shows, back to front
+    best_lap_bar_rect = pygame.Rect(screen_width // 2 - 100, 80, 200, 20)
+    last_lap_bar_rect = pygame.Rect(screen_width // 2 - 100, 180, 200, 20)
+    widgets = [
+        ('best_lap_text', (lap_delta_to_best_lap, tuple(lap_delta_text_rect)), lap_delta_text_rect,
+         lambda s: s.blit(lap_delta_text, lap_delta_text_rect.topleft)),
+        ('last_lap_text', (lap_delta_to_session_last_lap, session_last_lap_color, tuple(session_last_lap_text_rect)), session_last_lap_text_rect,
+         lambda s: s.blit(session_last_lap_text, session_last_lap_text_rect.topleft)),
+        # Draw the delta bars, the bar never leaves its rect
+        ('best_lap_bar', (lap_delta_to_best_lap, screen_width), best_lap_bar_rect,
+         lambda s: draw_delta_bar(s, best_lap_bar_rect, lap_delta_to_best_lap)),
+        ('last_lap_bar', (lap_delta_to_session_last_lap, screen_width), last_lap_bar_rect,
+         lambda s: draw_delta_bar(s, last_lap_bar_rect, lap_delta_to_session_last_lap)),
+    ]
+
+    # Update only the parts of the display that changed, nothing at all when nothing did
+    dirty_rects = draw_widgets(screen, background_layer, widgets, full_redraw)
+    full_redraw = False
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
 
     # Cap the frame rate to 20 FPS
     clock.tick(20)
@@ -1,12 +1,25 @@
 #!python3
 
 import re
+import os
+import sys
+import csv
+import json
+import time
+import traceback
+import asyncio
 import argparse
 import mmap
 import struct
+import zlib
 import ctypes
 import yaml
-from threading import Thread
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import cycle
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 from urllib import request, error
 from yaml.reader import Reader as YamlReader
 
@@ -15,8 +28,15 @@ try:
 except ImportError:
     from yaml import SafeLoader as YamlSafeLoader
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 VERSION = '1.3.5'
 
+TEST_FILE_ENV = 'IRSDK_TEST_FILE'  # default for --test in main(), IRSDK itself never reads it
+
 SIM_STATUS_URL = 'http://127.0.0.1:32034/get_sim_status?object=simStatus'
 
 DATAVALIDEVENTNAME = 'Local\\IRSDKDataValidEvent'
@@ -25,9 +45,27 @@ MEMMAPFILESIZE = 1164 * 1024
 BROADCASTMSGNAME = 'IRSDK_BROADCASTMSG'
 
 VAR_TYPE_MAP = ['c', '?', 'i', 'I', 'f', 'd']
+VAR_TYPE_SIZE = [1, 1, 4, 4, 4, 8]
+VAR_TYPE_NP_MAP = ['S1', '?', 'i4', 'u4', 'f4', 'f8']
+
+IBT_CHUNK_RECORDS = 4096
+IBT_SUMMARY_FIELDS = ('file_name', 'size', 'mtime_ns', 'records', 'laps', 'best_lap', 'best_lap_time',
+                      'fuel_per_lap', 'max_speed', 'incidents')
+
+IBT_DISK_HEADER = struct.Struct('=Qddii')  # session start date, start time, end time, lap count, record count
+IBT_VAR_HEADERS_OFFSET = 144  # header + disk sub header
+
+HUB_SHM_NAME = 'IRSDKHub'
+HUB_HEADER = struct.Struct('=QIIid')  # sequence, number of slots, slot size, hub pid, heartbeat (time.time())
+HUB_HEARTBEAT_TIMEOUT = 2.0  # seconds without a heartbeat before a hub counts as dead and its memory can be reclaimed
+HUB_SLOT_SEQ = struct.Struct('=Q')
 
 YAML_TRANSLATER = bytes.maketrans(b'\x81\x8D\x8F\x90\x9D', b'     ')
 YAML_CODE_PAGE = 'cp1252'
+YAML_SECTION_RE = re.compile(rb'\n(\w+):\n')
+# sections handled by parse_session_info(), everything else always goes through PyYAML
+YAML_FAST_SECTIONS = ('WeekendInfo', 'DriverInfo', 'SessionInfo', 'SplitTimeInfo')
+YAML_DRIVER_NAME_KEYS = ('DriverSetupName', 'UserName', 'TeamName', 'AbbrevName', 'Initials')
 
 class StatusField:
     status_connected = 1
@@ -311,8 +349,10 @@ class Header(IRSDKStruct):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # two copies in rotation, so previous frozen frame stays readable while next one is copied
+        frozen_memory_pool = cycle([bytearray(self.buf_len), bytearray(self.buf_len)])
         self.var_buf = [
-            VarBuffer(self._shared_mem, 48 + i * 16, buf_len=self.buf_len)
+            VarBuffer(self._shared_mem, 48 + i * 16, buf_len=self.buf_len, frozen_memory_pool=frozen_memory_pool)
             for i in range(self.num_buf)
         ]
 
@@ -320,14 +360,17 @@ class VarBuffer(IRSDKStruct):
     tick_count = IRSDKStruct.property_value(0, 'i')
     _buf_offset = IRSDKStruct.property_value(4, 'i')
 
-    def __init__(self, *args, buf_len, **kwargs):
+    def __init__(self, *args, buf_len, frozen_memory_pool, **kwargs):
         super().__init__(*args, **kwargs)
         self.is_memory_frozen = False
         self._frozen_memory = None
+        self._frozen_memory_pool = frozen_memory_pool
         self._buf_len = buf_len
 
     def freeze(self):
-        self._frozen_memory = self._shared_mem[self._buf_offset : self._buf_offset + self._buf_len]
+        buf_offset = self._buf_offset
+        self._frozen_memory = next(self._frozen_memory_pool)
+        self._frozen_memory[:] = memoryview(self._shared_mem)[buf_offset : buf_offset + self._buf_len]
         self.is_memory_frozen = True
 
     def unfreeze(self):
@@ -337,18 +380,141 @@ class VarBuffer(IRSDKStruct):
     def get_memory(self):
         return self._frozen_memory if self.is_memory_frozen else self._shared_mem
 
+    def get_array(self, dtype):
+        # zero-copy view, keep it only while the var buffer is frozen (or the mmap is open)
+        return np.ndarray((), dtype, buffer=self.get_memory(), offset=self.buf_offset)
+
     @property
     def buf_offset(self):
         return 0 if self.is_memory_frozen else self._buf_offset
 
-class VarHeader(IRSDKStruct):
-    type = IRSDKStruct.property_value(0, 'i')
-    offset = IRSDKStruct.property_value(4, 'i')
-    count = IRSDKStruct.property_value(8, 'i')
-    count_as_time = IRSDKStruct.property_value(12, '?')
-    name = IRSDKStruct.property_value_str(16, '32s')
-    desc = IRSDKStruct.property_value_str(48, '64s')
-    unit = IRSDKStruct.property_value_str(112, '32s')
+class VarBufferTracker:
+    __slots__ = ('var_buf', 'latest', 'previous', 'next', 'tick_count')
+
+    def __init__(self, var_buf):
+        self.var_buf = var_buf
+        self.latest = var_buf[0]
+        self.previous = var_buf[-1]
+        self.next = var_buf[1 % len(var_buf)]
+        self.tick_count = None
+
+    def update(self):
+        # sim writes var buffers round robin, so while the buffer after
+        # the latest one is still older there is nothing new to look for.
+        # latest one changed under us means tick counts went back (sim or replay restarted), rescan
+        if self.tick_count is not None and self.latest.tick_count == self.tick_count and self.next.tick_count <= self.tick_count:
+            return False
+
+        latest = previous = None
+        latest_tick = previous_tick = None
+        for i, var_buf in enumerate(self.var_buf):
+            tick_count = var_buf.tick_count
+            if latest_tick is None or tick_count > latest_tick:
+                previous, previous_tick = latest, latest_tick
+                latest, latest_tick, latest_index = var_buf, tick_count, i
+            elif previous_tick is None or tick_count > previous_tick:
+                previous, previous_tick = var_buf, tick_count
+        self.latest = latest
+        self.previous = previous or latest
+        self.next = self.var_buf[(latest_index + 1) % len(self.var_buf)]
+        new_data = latest_tick != self.tick_count
+        self.tick_count = latest_tick
+        return new_data
+
+class VarHeader:
+    # parsed once from its 144 byte record, var header block does not change while connected
+    __slots__ = ('type', 'offset', 'count', 'count_as_time', 'name', '_desc', '_unit')
+
+    _struct = struct.Struct('=3i?3x32s64s32s')
+
+    def __init__(self, type, offset, count, count_as_time, name, desc, unit):
+        self.type = type
+        self.offset = offset
+        self.count = count
+        self.count_as_time = count_as_time
+        self.name = sys.intern(name.strip(b'\x00').decode('latin-1'))
+        # rarely read, decoded on access
+        self._desc = desc
+        self._unit = unit
+
+    def __repr__(self):
+        return f'''<{self.__class__.__module__}.{self.__class__.__name__} {', '.join(
+                f'{k}={getattr(self, k)!r}'
+                for k in ('type', 'offset', 'count', 'count_as_time', 'name', 'desc', 'unit')
+            )}>'''
+
+    @property
+    def desc(self):
+        return self._desc.strip(b'\x00').decode('latin-1')
+
+    @property
+    def unit(self):
+        return self._unit.strip(b'\x00').decode('latin-1')
+
+    @classmethod
+    def parse_table(cls, shared_mem, offset, num_vars):
+        with memoryview(shared_mem)[offset : offset + num_vars * cls._struct.size] as block:
+            return [cls(*fields) for fields in cls._struct.iter_unpack(block)]
+
+class VarDecoder:
+    __slots__ = ('name', 'offset', 'count', 'fmt', 'size', 'unpack_from')
+
+    def __init__(self, var_header):
+        self.name = var_header.name
+        self.offset = var_header.offset
+        self.count = var_header.count
+        self.fmt = VAR_TYPE_MAP[var_header.type] * self.count
+        self.size = VAR_TYPE_SIZE[var_header.type] * self.count
+        self.unpack_from = struct.Struct(self.fmt).unpack_from
+
+    def decode(self, memory, buf_offset=0):
+        res = self.unpack_from(memory, buf_offset + self.offset)
+        return res[0] if self.count == 1 else list(res)
+
+def var_headers_dtype(var_headers, buf_len):
+    if np is None:
+        raise ImportError('numpy is required for var buffer arrays')
+    return np.dtype(dict(
+        names=[var_header.name for var_header in var_headers],
+        formats=[
+            VAR_TYPE_NP_MAP[var_header.type] if var_header.count == 1 else (VAR_TYPE_NP_MAP[var_header.type], (var_header.count,))
+            for var_header in var_headers
+        ],
+        offsets=[var_header.offset for var_header in var_headers],
+        itemsize=buf_len,
+    ))
+
+class SnapshotPlan:
+    __slots__ = ('names', 'offset', 'unpack_from', 'fields', 'record')
+
+    def __init__(self, names, var_decoders):
+        # a name asked for twice is returned once, namedtuple fields have to be unique
+        self.names = tuple(dict.fromkeys(names))
+        self.record = namedtuple('Snapshot', self.names)
+
+        # one struct covering all requested vars, gaps skipped with pad bytes
+        found = sorted((var_decoders[name] for name in set(self.names) if name in var_decoders), key=lambda v: v.offset)
+        self.offset = found[0].offset if found else 0
+        fmt = ['=']
+        positions = {}
+        pos = 0
+        end = self.offset
+        for var_decoder in found:
+            if var_decoder.offset > end:
+                fmt.append('%dx' % (var_decoder.offset - end))
+            fmt.append(var_decoder.fmt)
+            positions[var_decoder.name] = (pos, var_decoder.count)
+            pos += var_decoder.count
+            end = var_decoder.offset + var_decoder.size
+        self.unpack_from = struct.Struct(''.join(fmt)).unpack_from
+        self.fields = tuple(positions.get(name) for name in self.names)
+
+    def decode(self, memory, buf_offset=0):
+        values = self.unpack_from(memory, buf_offset + self.offset)
+        return self.record._make([
+            None if field is None else values[field[0]] if field[1] == 1 else list(values[field[0]:field[0] + field[1]])
+            for field in self.fields
+        ])
 
 class DiskSubHeader(IRSDKStruct):
     session_start_date = IRSDKStruct.property_value(0, 'Q')
@@ -362,6 +528,7 @@ class IRSDK:
         self.parse_yaml_async = parse_yaml_async
         self.is_initialized = False
         self.last_session_info_update = 0
+        self.new_data = False
 
         self._shared_mem = None
         self._header = None
@@ -370,21 +537,29 @@ class IRSDK:
         self.__var_headers = None
         self.__var_headers_dict = None
         self.__var_headers_names = None
+        self.__var_decoders = None
+        self.__var_headers_layout = None
+        self.__var_headers_layout_hint = None
+        self.__snapshot_plans = {}
+        self.__var_dtype = None
         self.__var_buffer_latest = None
+        self.__var_buffer_tracker = None
+        self.__var_buffer_frozen_tick = None
         self.__session_info_dict = {}
+        self.__session_info_index = None
+        self.__session_info_update_time = None
+        self.__session_info_lock = Lock()
+        self.__session_info_pool = None
         self.__broadcast_msg_id = None
+        self.__stream = None
         self.__test_file = None
         self.__workaround_connected_state = 0
 
     def __getitem__(self, key):
-        if key in self._var_headers_dict:
-            var_header = self._var_headers_dict[key]
+        var_decoder = self._var_decoders.get(key)
+        if var_decoder is not None:
             var_buf_latest = self._var_buffer_latest
-            res = struct.unpack_from(
-                VAR_TYPE_MAP[var_header.type] * var_header.count,
-                var_buf_latest.get_memory(),
-                var_buf_latest.buf_offset + var_header.offset)
-            return res[0] if var_header.count == 1 else list(res)
+            return var_decoder.decode(var_buf_latest.get_memory(), var_buf_latest.buf_offset)
 
         return self._get_session_info(key)
 
@@ -413,6 +588,35 @@ class IRSDK:
             self.__var_headers_names = [var_header.name for var_header in self._var_headers]
         return self.__var_headers_names
 
+    @property
+    def frozen_tick_count(self):
+        return self.__var_buffer_frozen_tick if self.__var_buffer_latest else None
+
+    @property
+    def var_headers_layout(self):
+        # changes whenever the sim rewrote its var header block, checked on every freeze
+        return self.__var_headers_layout
+
+    def snapshot(self, names):
+        # decode all requested vars from latest var buffer with a single unpack
+        names = tuple(names)
+        plan = self.__snapshot_plans.get(names)
+        if plan is None:
+            plan = self.__snapshot_plans[names] = SnapshotPlan(names, self._var_decoders)
+        var_buf_latest = self._var_buffer_latest
+        return plan.decode(var_buf_latest.get_memory(), var_buf_latest.buf_offset)
+
+    def frames(self, names, hz=60):
+        # async for frame in ir.frames([...]), all subscribers share one reader
+        if self.__stream is None:
+            self.__stream = IRSDKStream(self)
+        return self.__stream.frames(names, hz)
+
+    def var_buffer_array(self):
+        # numpy record over latest var buffer, array vars (CarIdx*) are views, not lists
+        var_buf_latest = self._var_buffer_latest
+        return var_buf_latest.get_array(self._var_dtype)
+
     def startup(self, test_file=None, dump_to=None):
         if test_file is None:
             if not self._check_sim_status():
@@ -435,6 +639,12 @@ class IRSDK:
                     f.write(self._shared_mem)
             self._header = Header(self._shared_mem)
             self.is_initialized = self._header.version >= 1 and len(self._header.var_buf) > 0
+            if self.is_initialized:
+                self.__var_buffer_tracker = VarBufferTracker(self._header.var_buf)
+                self.__var_buffer_frozen_tick = None
+                # startup again without shutdown keeps what was parsed, unless var header block changed meanwhile
+                self.__var_headers_layout_hint = None
+                self._check_var_headers_layout()
 
         return self.is_initialized
 
@@ -449,8 +659,21 @@ class IRSDK:
         self.__var_headers = None
         self.__var_headers_dict = None
         self.__var_headers_names = None
+        self.__var_decoders = None
+        self.__var_headers_layout = None
+        self.__var_headers_layout_hint = None
+        self.__snapshot_plans = {}
+        self.__var_dtype = None
         self.__var_buffer_latest = None
+        self.__var_buffer_tracker = None
+        self.__var_buffer_frozen_tick = None
+        self.new_data = False
         self.__session_info_dict = {}
+        self.__session_info_index = None
+        self.__session_info_update_time = None
+        if self.__session_info_pool:
+            self.__session_info_pool.shutdown(wait=False)
+            self.__session_info_pool = None
         self.__broadcast_msg_id = None
         if self.__test_file:
             self.__test_file.close()
@@ -524,19 +747,19 @@ class IRSDK:
 
     @property
     def _var_buffer_latest(self):
+        if self.__var_buffer_latest:
+            return self.__var_buffer_latest
         # return 2nd most recent var buffer
         # because it might be a situation (with most recent var buffer)
         # that half of var buffer written with new data
         # and other half still old
-        return sorted(self._header.var_buf, key=lambda v: v.tick_count, reverse=True)[1]
+        self.__var_buffer_tracker.update()
+        return self.__var_buffer_tracker.previous
 
     @property
     def _var_headers(self):
         if self.__var_headers is None:
-            self.__var_headers = []
-            for i in range(self._header.num_vars):
-                var_header = VarHeader(self._shared_mem, self._header.var_header_offset + i * 144)
-                self._var_headers.append(var_header)
+            self.__var_headers = VarHeader.parse_table(self._shared_mem, self._header.var_header_offset, self._header.num_vars)
         return self.__var_headers
 
     @property
@@ -547,11 +770,69 @@ class IRSDK:
                 self.__var_headers_dict[var_header.name] = var_header
         return self.__var_headers_dict
 
+    @property
+    def _var_decoders(self):
+        # one precompiled struct per var, built once per var header block
+        if self.__var_decoders is None:
+            self.__var_decoders = {
+                var_header.name: VarDecoder(var_header)
+                for var_header in self._var_headers
+            }
+        return self.__var_decoders
+
+    @property
+    def _var_dtype(self):
+        if self.__var_dtype is None:
+            self.__var_dtype = var_headers_dtype(self._var_headers, self._header.buf_len)
+        return self.__var_dtype
+
+    def _get_var_headers_layout(self):
+        header = self._header
+        var_headers_len = header.num_vars * VarHeader._struct.size
+        with memoryview(self._shared_mem)[header.var_header_offset : header.var_header_offset + var_headers_len] as block:
+            return header.num_vars, header.var_header_offset, header.num_buf, header.buf_len, zlib.crc32(block)
+
+    def _get_var_headers_layout_hint(self):
+        # cheap header fields that change along with a var header rewrite
+        header = self._header
+        return header.status, header.session_info_update, header.num_vars, header.var_header_offset, header.num_buf, header.buf_len
+
+    def _check_var_headers_layout(self):
+        # sim can rewrite var header block (e.g. after reconnect), drop everything parsed from it.
+        # checksum of whole block costs more than rest of freeze, so only take it when
+        # cheap header fields changed or tick count went back (sim or replay restarted)
+        var_headers_layout_hint = self._get_var_headers_layout_hint()
+        frozen_tick = self.__var_buffer_frozen_tick
+        if self.__var_headers_layout_hint == var_headers_layout_hint and (
+                frozen_tick is None or self.__var_buffer_tracker.latest.tick_count >= frozen_tick):
+            return
+        self.__var_headers_layout_hint = var_headers_layout_hint
+        var_headers_layout = self._get_var_headers_layout()
+        if self.__var_headers_layout == var_headers_layout:
+            return
+        self.__var_headers_layout = var_headers_layout
+        self.__var_headers = None
+        self.__var_headers_dict = None
+        self.__var_headers_names = None
+        self.__var_decoders = None
+        self.__snapshot_plans = {}
+        self.__var_dtype = None
+        # var buffers and their frozen copies are sized from header, so they go too
+        self._header = Header(self._shared_mem)
+        self.__var_buffer_tracker = VarBufferTracker(self._header.var_buf)
+        self.__var_buffer_frozen_tick = None
+
     def freeze_var_buffer_latest(self):
         self.unfreeze_var_buffer_latest()
         self._wait_valid_data_event()
-        self.__var_buffer_latest = sorted(self._header.var_buf, key=lambda v: v.tick_count, reverse=True)[0]
+        self._check_var_headers_layout()
+        self.__var_buffer_tracker.update()
+        self.__var_buffer_latest = self.__var_buffer_tracker.latest
         self.__var_buffer_latest.freeze()
+        # lets caller skip decode and redraw when sim has not ticked since previous freeze
+        self.new_data = self.__var_buffer_tracker.tick_count != self.__var_buffer_frozen_tick
+        self.__var_buffer_frozen_tick = self.__var_buffer_tracker.tick_count
+        return self.new_data
 
     def unfreeze_var_buffer_latest(self):
         if self.__var_buffer_latest:
@@ -563,6 +844,12 @@ class IRSDK:
             return self.__session_info_dict[key]['update']
         return None
 
+    def get_session_info_latency_by_key(self, key):
+        # seconds from noticing session info update to parsed section being available
+        if key in self.__session_info_dict:
+            return self.__session_info_dict[key].get('latency')
+        return None
+
     def _wait_valid_data_event(self):
         if self._data_valid_event is not None:
             return ctypes.windll.kernel32.WaitForSingleObject(self._data_valid_event, 32) == 0 if self._data_valid_event else False
@@ -570,8 +857,10 @@ class IRSDK:
             return True
 
     def _get_session_info(self, key):
-        if self.last_session_info_update < self._header.session_info_update:
+        if self.last_session_info_update < self._header.session_info_update or self.__session_info_index is None:
             self.last_session_info_update = self._header.session_info_update
+            self.__session_info_update_time = time.perf_counter()
+            self.__session_info_index = self._index_session_info()
             for session_data in self.__session_info_dict.values():
                 # keep previous parsed data, in case binary data not changed
                 if session_data['data']:
@@ -588,55 +877,90 @@ class IRSDK:
             return session_data['data']
 
         if self.parse_yaml_async:
-            if 'async_session_info_update' not in session_data or session_data['async_session_info_update'] < self.last_session_info_update:
-                session_data['async_session_info_update'] = self.last_session_info_update
-                Thread(target=self._parse_yaml, args=(key, session_data)).start()
+            with self.__session_info_lock:
+                if 'async_session_info_update' not in session_data or session_data['async_session_info_update'] < self.last_session_info_update:
+                    session_data['async_session_info_update'] = self.last_session_info_update
+                    # at most one parse per section in flight, it picks up newer updates itself when done
+                    if not session_data.get('async_in_flight'):
+                        session_data['async_in_flight'] = True
+                        if self.__session_info_pool is None:
+                            self.__session_info_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='irsdk_yaml')
+                        self.__session_info_pool.submit(self._parse_yaml_async, key, session_data)
         else:
             self._parse_yaml(key, session_data)
         return session_data['data']
 
-    def _get_session_info_binary(self, key):
+    def _parse_yaml_async(self, key, session_data):
+        while True:
+            session_info_update = session_data['async_session_info_update']
+            try:
+                self._parse_yaml(key, session_data)
+            except Exception:
+                with self.__session_info_lock:
+                    session_data['async_in_flight'] = False
+                # nobody looks at the pool's future, print it like the old parse thread did
+                print('Failed to parse session info {}:'.format(key))
+                traceback.print_exc()
+                return
+            with self.__session_info_lock:
+                # newer update came in while parsing, result was dropped, parse again
+                if session_data['async_session_info_update'] == session_info_update:
+                    session_data['async_in_flight'] = False
+                    return
+
+    def _index_session_info(self):
+        # byte range of every top level section, one scan per session info update
         start = self._header.session_info_offset
         end = start + self._header.session_info_len
-        # search section by key
-        match_start = re.compile(('\n%s:\n' % key).encode(YAML_CODE_PAGE)).search(self._shared_mem, start, end)
-        if not match_start:
-            return None
-        match_end = re.compile(b'\n\n').search(self._shared_mem, match_start.start() + 1, end)
-        if not match_end:
-            return None
-        return self._shared_mem[match_start.start() + 1 : match_end.start()]
+        index = {}
+        # sections end at a blank line, next one is searched from there, so extra blank lines don't matter
+        match_start = YAML_SECTION_RE.search(self._shared_mem, start, end)
+        while match_start:
+            match_end = self._shared_mem.find(b'\n\n', match_start.start() + 1, end)
+            if match_end < 0:
+                break
+            index[match_start.group(1).decode(YAML_CODE_PAGE)] = (match_start.start() + 1, match_end)
+            match_start = YAML_SECTION_RE.search(self._shared_mem, match_end, end)
+        return index
 
     def _parse_yaml(self, key, session_data):
         session_info_update = self.last_session_info_update
-        data_binary = self._get_session_info_binary(key)
+        session_info_update_time = self.__session_info_update_time
+        section = self.__session_info_index.get(key)
 
         # section not found
-        if not data_binary:
+        if not section:
             if 'data_last' in session_data:
                 return session_data['data_last']
             else:
                 return None
 
-        # is binary data the same as last time?
-        if 'data_binary' in session_data and data_binary == session_data['data_binary'] and 'data_last' in session_data:
+        # is section the same as last time?
+        with memoryview(self._shared_mem)[section[0] : section[1]] as section_mem:
+            checksum = zlib.crc32(section_mem)
+        if session_data.get('checksum') == checksum and 'data_last' in session_data:
             session_data['data'] = session_data['data_last']
             return session_data['data']
-        session_data['data_binary'] = data_binary
+        data_binary = self._shared_mem[section[0] : section[1]]
 
         # parsing
         yaml_src = re.sub(YamlReader.NON_PRINTABLE, '', data_binary.translate(YAML_TRANSLATER).rstrip(b'\x00').decode(YAML_CODE_PAGE))
-        if key == 'DriverInfo':
-            def name_replace(m):
-                return m.group(1) + '"%s"' % re.sub(r'(["\\])', r'\\\1', m.group(2))
-            yaml_src = re.sub(r'((?:DriverSetupName|UserName|TeamName|AbbrevName|Initials): )(.*)', name_replace, yaml_src)
-        yaml_src = re.sub(r'(\w+: )(,.*)', r'\1"\2"', yaml_src)
-        result = yaml.load(yaml_src, Loader=CustomYamlSafeLoader)
+        result = None
+        if key in YAML_FAST_SECTIONS:
+            try:
+                result = {key: parse_session_info(yaml_src, key)}
+            except ValueError:
+                # outside of what fast parser knows, PyYAML decides
+                pass
+        if result is None:
+            result = load_session_info_yaml(yaml_src, key)
         # check if result is available, and yaml data is not updated while we were parsing it in async mode
         if result and (not self.parse_yaml_async or self.last_session_info_update == session_info_update):
             session_data['data'] = result[key]
             if session_data['data']:
                 session_data['update'] = session_info_update
+                session_data['checksum'] = checksum
+                session_data['latency'] = time.perf_counter() - session_info_update_time
             elif 'data_last' in session_data:
                 session_data['data'] = session_data['data_last']
 
@@ -662,6 +986,439 @@ class IRSDK:
             return num + 1000 * (num_place + zero)
         return num
 
+TelemetryFrame = namedtuple('TelemetryFrame', ('tick_count', 'data'))
+
+class IRSDKReader:
+    # reads telemetry in background thread, render loop just picks up latest frame
+    # while reader is running it owns var buffer freezing, don't call freeze_var_buffer_latest() elsewhere
+    def __init__(self, ir, names, poll_interval=1 / 240):
+        self.ir = ir
+        self.names = tuple(names)
+        self.poll_interval = poll_interval
+        self.frame = None
+
+        self._stop_event = Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.ir.unfreeze_var_buffer_latest()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            # waits on data valid event when connected to sim
+            if self.ir.freeze_var_buffer_latest():
+                # frame is immutable, publishing it is a single reference swap
+                self.frame = TelemetryFrame(self.ir.frozen_tick_count, self.ir.snapshot(self.names))
+            else:
+                self._stop_event.wait(self.poll_interval)
+
+class StreamSubscriber:
+    __slots__ = ('names', 'interval', 'next_time', 'frame', 'event')
+
+    def __init__(self, names, hz):
+        self.names = tuple(names)
+        self.interval = 1 / hz
+        self.next_time = 0
+        self.frame = None
+        self.event = asyncio.Event()
+
+class IRSDKStream:
+    # single reader task for all async subscribers, each one gets latest frame at its own rate
+    def __init__(self, ir, poll_interval=1 / 240):
+        self.ir = ir
+        self.poll_interval = poll_interval
+
+        self._subscribers = []
+        self._task = None
+
+    async def frames(self, names, hz=60):
+        subscriber = StreamSubscriber(names, hz)
+        self._subscribers.append(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        try:
+            while True:
+                await subscriber.event.wait()
+                subscriber.event.clear()
+                yield subscriber.frame
+        finally:
+            self._subscribers.remove(subscriber)
+            if not self._subscribers and self._task:
+                self._task.cancel()
+                self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._subscribers:
+            # waiting on data valid event blocks, keep it off the event loop
+            if not await loop.run_in_executor(None, self.ir.freeze_var_buffer_latest):
+                await asyncio.sleep(self.poll_interval)
+                continue
+            now = loop.time()
+            tick_count = self.ir.frozen_tick_count
+            for subscriber in self._subscribers:
+                if now < subscriber.next_time:
+                    continue
+                # stays on its own beat, one fallen behind (first frame, pause) starts over from now
+                subscriber.next_time += subscriber.interval
+                if subscriber.next_time <= now:
+                    subscriber.next_time = now + subscriber.interval
+                subscriber.frame = TelemetryFrame(tick_count, self.ir.snapshot(subscriber.names))
+                subscriber.event.set()
+
+class IRSDKHub:
+    # decodes telemetry once per tick and publishes it to a shared memory ring for other processes
+    # layout: header, var layout text (name:fmt per line), slots of (slot sequence, tick, values)
+    def __init__(self, ir, names, shm_name=HUB_SHM_NAME, slots=16):
+        self.ir = ir
+        self.names = tuple(dict.fromkeys(names))
+        self.sequence = 0
+        self._pid = os.getpid()
+
+        self._var_decoders = ir._var_decoders
+        self._plan, self._values, layout = self._build_layout(self._var_decoders)
+        self._layout = layout
+        self._reorder = None
+        self._slots = slots
+        self._slot_size = HUB_SLOT_SEQ.size + self._values.size
+        self._slots_offset = HUB_HEADER.size + 4 + len(layout)
+
+        self._shm = self._create_shm(shm_name, self._slots_offset + slots * self._slot_size)
+        struct.pack_into('=i', self._shm.buf, HUB_HEADER.size, len(layout))
+        self._shm.buf[HUB_HEADER.size + 4 : self._slots_offset] = layout
+        HUB_HEADER.pack_into(self._shm.buf, 0, self.sequence, slots, self._slot_size, self._pid, time.time())
+
+    def _build_layout(self, var_decoders):
+        # values are copied in var buffer order, so one unpack of the plan feeds one pack into the slot
+        known_names = sorted((name for name in self.names if name in var_decoders), key=lambda name: var_decoders[name].offset)
+        plan = SnapshotPlan(known_names, var_decoders)
+        layout = [(name, var_decoders[name].fmt) for name in known_names]
+        layout += [(name, 'x') for name in self.names if name not in var_decoders]
+        values = struct.Struct('=i' + ''.join(fmt for _, fmt in layout))
+        return plan, values, '\n'.join('%s:%s' % var for var in layout).encode('latin-1')
+
+    def _create_shm(self, shm_name, size):
+        try:
+            return shared_memory.SharedMemory(shm_name, create=True, size=size)
+        except FileExistsError:
+            pass
+        existing = shared_memory.SharedMemory(shm_name)
+        sequence, slots, slot_size, pid, _ = HUB_HEADER.unpack_from(existing.buf, 0)
+        if _hub_is_alive(existing.buf):
+            existing.close()
+            raise FileExistsError('IRSDKHub %r is already published by pid %d' % (shm_name, pid))
+        # left behind by a hub that crashed. Same layout is taken over in place, readers still attached
+        # to it carry on. On windows that is the only way, memory stays until every reader let go of it
+        if (slots, slot_size) == (self._slots, self._slot_size) and existing.size >= size and \
+                bytes(existing.buf[HUB_HEADER.size : self._slots_offset]) == struct.pack('=i', len(self._layout)) + self._layout:
+            # sequence goes on from where it stopped, so readers never take an old slot for a new one
+            self.sequence = sequence
+            return existing
+        existing.close()
+        existing.unlink()
+        try:
+            return shared_memory.SharedMemory(shm_name, create=True, size=size)
+        except FileExistsError:
+            raise FileExistsError('IRSDKHub %r of a dead hub is still open in a reader with another layout, '
+                                  'close the readers first' % shm_name) from None
+
+    def publish(self):
+        buf = self._shm.buf
+        if HUB_HEADER.unpack_from(buf, 0)[3] != self._pid:
+            raise RuntimeError('IRSDKHub memory was taken over by another hub')
+        if not self.ir.freeze_var_buffer_latest():
+            # no new tick (sim paused or gone) still has to show the hub is alive
+            HUB_HEADER.pack_into(buf, 0, self.sequence, self._slots, self._slot_size, self._pid, time.time())
+            return False
+        var_decoders = self.ir._var_decoders
+        if var_decoders is not self._var_decoders:
+            self._rebuild_plan(var_decoders)
+        var_buf_latest = self.ir._var_buffer_latest
+        values = self._plan.unpack_from(var_buf_latest.get_memory(), var_buf_latest.buf_offset + self._plan.offset)
+        if self._reorder:
+            values = self._reorder(values)
+        self.sequence += 1
+        slot_offset = self._slots_offset + (self.sequence % self._slots) * self._slot_size
+        # mark slot as being written, readers check slot sequence before and after reading values
+        HUB_SLOT_SEQ.pack_into(buf, slot_offset, 0)
+        self._values.pack_into(buf, slot_offset + HUB_SLOT_SEQ.size, self.ir.frozen_tick_count, *values)
+        HUB_SLOT_SEQ.pack_into(buf, slot_offset, self.sequence)
+        HUB_HEADER.pack_into(buf, 0, self.sequence, self._slots, self._slot_size, self._pid, time.time())
+        return True
+
+    def _rebuild_plan(self, var_decoders):
+        # sim rewrote its var headers, readers parsed the published layout so that one stays
+        plan, _, layout = self._build_layout(var_decoders)
+        self._var_decoders = var_decoders
+        self._plan = plan
+        self._reorder = None
+        if layout == self._layout:
+            return
+        if sorted(layout.split(b'\n')) != sorted(self._layout.split(b'\n')):
+            raise RuntimeError('IRSDKHub vars changed in sim, readers have to reconnect to a new hub')
+        # same vars at other offsets, unpacked values are put back in published order
+        positions = {}
+        pos = 0
+        for name in plan.names:
+            positions[name] = range(pos, pos + var_decoders[name].count)
+            pos += var_decoders[name].count
+        index = [i for line in self._layout.split(b'\n') for i in positions.get(line.rsplit(b':', 1)[0].decode('latin-1'), ())]
+        self._reorder = lambda values: [values[i] for i in index]
+
+    def run(self, poll_interval=1 / 240):
+        try:
+            while True:
+                if not self.publish():
+                    time.sleep(poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if self._shm:
+            # memory taken over by another hub is not ours to remove
+            owned = HUB_HEADER.unpack_from(self._shm.buf, 0)[3] == self._pid
+            self._shm.close()
+            if owned:
+                self._shm.unlink()
+            self._shm = None
+
+def _hub_is_alive(buf):
+    # hub memory outlives a crashed hub, its heartbeat tells if anyone still publishes to it
+    _, _, _, pid, heartbeat = HUB_HEADER.unpack_from(buf, 0)
+    if os.name == 'posix':
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+    # live hub beats every publish or poll, give it the timeout to show it
+    while time.time() - heartbeat < HUB_HEARTBEAT_TIMEOUT:
+        time.sleep(0.05)
+        if HUB_HEADER.unpack_from(buf, 0)[4] != heartbeat:
+            return True
+    return False
+
+class IRSDKHubClient:
+    # cheap reader side of IRSDKHub, one per overlay process
+    def __init__(self, shm_name=HUB_SHM_NAME):
+        try:
+            self._shm = shared_memory.SharedMemory(shm_name, track=False)
+        except TypeError:
+            # python < 3.13 tracks attached segments too and unlinks them when reader exits
+            self._shm = shared_memory.SharedMemory(shm_name)
+            if os.name == 'posix':
+                # tracker knows posix segments by their name with leading slash
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister('/' + self._shm.name, 'shared_memory')
+        buf = self._shm.buf
+        _, self._slots, self._slot_size, _, _ = HUB_HEADER.unpack_from(buf, 0)
+        layout_len = struct.unpack_from('=i', buf, HUB_HEADER.size)[0]
+        layout = bytes(buf[HUB_HEADER.size + 4 : HUB_HEADER.size + 4 + layout_len]).decode('latin-1')
+        self._slots_offset = HUB_HEADER.size + 4 + layout_len
+
+        names, fmts = zip(*(line.split(':') for line in layout.split('\n')))
+        self.names = names
+        self._values = struct.Struct('=i' + ''.join(fmts))
+        self._record = namedtuple('Snapshot', names)
+        # positions of each name in unpacked values, None for vars sim does not have
+        self._fields = []
+        pos = 1
+        for fmt in fmts:
+            count = 0 if fmt == 'x' else len(fmt)
+            self._fields.append(None if count == 0 else (pos, count))
+            pos += count
+        self._sequence = 0
+        self._frame = None
+
+    @property
+    def sequence(self):
+        return HUB_HEADER.unpack_from(self._shm.buf, 0)[0]
+
+    @property
+    def frame(self):
+        buf = self._shm.buf
+        sequence = HUB_HEADER.unpack_from(buf, 0)[0]
+        if sequence == self._sequence:
+            return self._frame
+        slot_offset = self._slots_offset + (sequence % self._slots) * self._slot_size
+        values = self._values.unpack_from(buf, slot_offset + HUB_SLOT_SEQ.size)
+        # slot rewritten while reading (reader fell a whole ring behind), keep previous frame
+        if HUB_SLOT_SEQ.unpack_from(buf, slot_offset)[0] != sequence:
+            return self._frame
+        self._sequence = sequence
+        self._frame = TelemetryFrame(values[0], self._record._make([
+            None if field is None else values[field[0]] if field[1] == 1 else list(values[field[0]:field[0] + field[1]])
+            for field in self._fields
+        ]))
+        return self._frame
+
+    def close(self):
+        if self._shm:
+            self._shm.close()
+            self._shm = None
+
+class IRSDKRecorder:
+    # writes every sim tick to file in ibt layout, so IBT() can read recordings back
+    # layout: header, disk sub header, var headers, records, session info (written on close)
+    def __init__(self, ir, file_name, flush_interval=1.0, preallocate_seconds=60):
+        self.ir = ir
+        self.file_names = []
+        self._flush_interval = flush_interval
+        self._preallocate_seconds = preallocate_seconds
+        self._file = None
+        self._open(file_name)
+
+    def _open(self, file_name):
+        ir = self.ir
+        self.file_name = file_name
+        self.file_names.append(file_name)
+        self.record_count = 0
+
+        header = ir._header
+        self._var_headers_layout = ir.var_headers_layout
+        self._buf_len = header.buf_len
+        self._tick_rate = header.tick_rate
+        self._var_headers_len = header.num_vars * 144
+        self._records_offset = IBT_VAR_HEADERS_OFFSET + self._var_headers_len
+        self._session_time = ir._var_decoders.get('SessionTime')
+        self._lap = ir._var_decoders.get('Lap')
+        self._start_date = int(time.time())
+        self._start_time = self._end_time = 0.0
+        self._lap_count = 0
+        self._tick_count = 0
+        self._session_info = b''
+        self._session_info_update = None
+
+        # records are collected in memory and written once per flush interval
+        self._pending = bytearray(max(1, int(self._flush_interval * self._tick_rate)) * self._buf_len)
+        self._pending_len = 0
+        self._preallocate_len = max(1, int(self._preallocate_seconds * self._tick_rate)) * self._buf_len
+        self._file_len = 0
+
+        self._file = open(file_name, 'w+b')
+        self._file.write(bytes(IBT_VAR_HEADERS_OFFSET))
+        self._file.write(ir._shared_mem[header.var_header_offset : header.var_header_offset + self._var_headers_len])
+        self._write_header()
+        self._preallocate()
+
+    def record(self):
+        if not self.ir.freeze_var_buffer_latest():
+            return False
+        if self.ir.var_headers_layout != self._var_headers_layout:
+            # sim rewrote its var headers, records would not match the ones written at open anymore
+            self._roll_over()
+        var_buf_latest = self.ir._var_buffer_latest
+        memory = var_buf_latest.get_memory()
+        buf_offset = var_buf_latest.buf_offset
+
+        self._pending[self._pending_len : self._pending_len + self._buf_len] = memoryview(memory)[buf_offset : buf_offset + self._buf_len]
+        self._pending_len += self._buf_len
+        self.record_count += 1
+        self._tick_count = self.ir.frozen_tick_count
+        if self._session_time:
+            self._end_time = self._session_time.decode(memory, buf_offset)
+            if self.record_count == 1:
+                self._start_time = self._end_time
+        if self._lap:
+            self._lap_count = max(self._lap_count, self._lap.decode(memory, buf_offset))
+        if self._session_info_update != self.ir._header.session_info_update:
+            self._session_info_update = self.ir._header.session_info_update
+            self._copy_session_info()
+
+        if self._pending_len == len(self._pending):
+            self.flush()
+        return True
+
+    def flush(self):
+        if self._pending_len == 0:
+            return
+        if self._records_offset + self.record_count * self._buf_len > self._file_len:
+            self._preallocate()
+        self._file.seek(self._records_offset + self.record_count * self._buf_len - self._pending_len)
+        self._file.write(memoryview(self._pending)[:self._pending_len])
+        self._pending_len = 0
+        # keep header up to date, so recording is readable up to last flush even if process dies
+        self._write_header()
+        self._file.flush()
+
+    def run(self, poll_interval=1 / 240):
+        try:
+            while True:
+                if not self.record():
+                    time.sleep(poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._file:
+            return
+        self.flush()
+        self._file.seek(self._records_offset + self.record_count * self._buf_len)
+        self._file.write(self._session_info)
+        self._file.truncate()
+        self._write_header(session_info_len=len(self._session_info))
+        self._file.close()
+        self._file = None
+
+    def _roll_over(self):
+        self.close()
+        base, ext = os.path.splitext(self.file_names[0])
+        file_name = '{}_{}{}'.format(base, len(self.file_names) + 1, ext)
+        print('Var headers changed, recording goes on in {}'.format(file_name))
+        self._open(file_name)
+
+    def _copy_session_info(self):
+        header = self.ir._header
+        session_info = self.ir._shared_mem[header.session_info_offset : header.session_info_offset + header.session_info_len]
+        self._session_info = session_info.rstrip(b'\x00')
+
+    def _preallocate(self):
+        # grow file in big steps instead of on every write
+        self._file_len = self._records_offset + self.record_count * self._buf_len + self._preallocate_len
+        self._file.truncate(self._file_len)
+
+    def _write_header(self, session_info_len=0):
+        header = self.ir._header
+        session_info_offset = self._records_offset + self.record_count * self._buf_len
+        self._file.seek(0)
+        self._file.write(struct.pack('=10i', header.version, header.status, self._tick_rate, self._session_info_update or 0,
+                                     session_info_len, session_info_offset, header.num_vars, IBT_VAR_HEADERS_OFFSET, 1, self._buf_len))
+        self._file.write(struct.pack('=8x2i', self._tick_count, self._records_offset))
+        self._file.seek(112)
+        self._file.write(IBT_DISK_HEADER.pack(self._start_date, self._start_time, self._end_time, self._lap_count, self.record_count))
+
+LapInfo = namedtuple('LapInfo', ('lap', 'start', 'stop', 'lap_time', 'valid'))
+
+class IBTChannel:
+    # lazy sequence over one ibt channel for bisect, only reads records it's asked for
+    __slots__ = ('ibt', 'key')
+
+    def __init__(self, ibt, key):
+        self.ibt = ibt
+        self.key = key
+
+    def __len__(self):
+        return self.ibt._disk_header.session_record_count
+
+    def __getitem__(self, index):
+        return self.ibt.get(index, self.key)
+
 class IBT:
     def __init__(self):
         self._ibt_file = None
@@ -672,6 +1429,11 @@ class IBT:
         self.__var_headers = None
         self.__var_headers_dict = None
         self.__var_headers_names = None
+        self.__var_decoders = None
+        self.__var_dtype = None
+        self.__laps = None
+        self.__laps_dict = None
+        self.__lap_dist_ranges = {}
         self.__session_info_dict = None
 
     def __getitem__(self, key):
@@ -714,19 +1476,91 @@ class IBT:
         self.__var_headers = None
         self.__var_headers_dict = None
         self.__var_headers_names = None
+        self.__var_decoders = None
+        self.__var_dtype = None
+        self.__laps = None
+        self.__laps_dict = None
+        self.__lap_dist_ranges = {}
         self.__session_info_dict = None
 
+    @property
+    def laps(self):
+        # record range per lap, cached next to ibt file so reopening doesn't need another scan
+        if not self._header:
+            return None
+        if self.__laps is None:
+            self.__laps = self._load_lap_index()
+            if self.__laps is None:
+                self.__laps = self._build_lap_index()
+                self._save_lap_index(self.__laps)
+            self.__laps_dict = {lap_info.lap: lap_info for lap_info in self.__laps}
+        return self.__laps
+
+    def lap(self, lap):
+        # records of lap are range(start, stop), e.g. get_columns(keys, lap_info.start, lap_info.stop)
+        if self.laps is None:
+            return None
+        return self.__laps_dict.get(lap)
+
+    def at_time(self, session_time, key):
+        return self._get_interpolated('SessionTime', session_time, key)
+
+    def at_distance(self, lap, lap_dist_pct, key):
+        lap_info = self.lap(lap)
+        if lap_info is None:
+            return None
+        if 'LapDistPct' not in self._var_headers_dict:
+            return None
+        return self._get_interpolated('LapDistPct', lap_dist_pct, key, *self._lap_dist_range(lap_info))
+
+    def _lap_dist_range(self, lap_info):
+        # Lap and LapDistPct don't flip on the same tick, so a lap can start with records still reading ~0.99
+        # or end with records already reading ~0.0, bisect needs the part where LapDistPct only rises
+        lap_dist_range = self.__lap_dist_ranges.get(lap_info.lap)
+        if lap_dist_range is None:
+            if np is not None:
+                lap_dist_pct = self.get_array('LapDistPct')[lap_info.start : lap_info.stop]
+                wraps = (np.flatnonzero(np.diff(lap_dist_pct) < -0.5) + 1).tolist()
+            else:
+                lap_dist_pct = [self.get(index, 'LapDistPct') for index in range(lap_info.start, lap_info.stop)]
+                wraps = [i for i in range(1, len(lap_dist_pct)) if lap_dist_pct[i] < lap_dist_pct[i - 1] - 0.5]
+            # longest run between wraps is the lap itself, the rest belongs to its neighbours
+            bounds = [0] + wraps + [len(lap_dist_pct)]
+            start, stop = max(zip(bounds, bounds[1:]), key=lambda run: run[1] - run[0])
+            lap_dist_range = self.__lap_dist_ranges[lap_info.lap] = (lap_info.start + start, lap_info.start + stop)
+        return lap_dist_range
+
+    def _get_interpolated(self, channel, target, key, start=0, stop=None):
+        if not self._header or key not in self._var_headers_dict or channel not in self._var_headers_dict:
+            return None
+        if stop is None:
+            stop = self._disk_header.session_record_count
+        if stop <= start:
+            return None
+        index = bisect_left(IBTChannel(self, channel), target, start, stop)
+        # outside of recorded range, clamp to first / last record
+        if index <= start:
+            return self.get(start, key)
+        if index >= stop:
+            return self.get(stop - 1, key)
+        x0, x1 = self.get(index - 1, channel), self.get(index, channel)
+        frac = (target - x0) / (x1 - x0) if x1 != x0 else 0.0
+        v0, v1 = self.get(index - 1, key), self.get(index, key)
+        if VAR_TYPE_MAP[self._var_headers_dict[key].type] not in ('f', 'd'):
+            # ints, bools, flags and chars can't be blended, take nearest record
+            return v0 if frac < 0.5 else v1
+        if isinstance(v0, list):
+            return [a + (b - a) * frac for a, b in zip(v0, v1)]
+        return v0 + (v1 - v0) * frac
+
     def get(self, index, key):
         if not self._header:
             return None
         if 0 > index >= self._disk_header.session_record_count:
             return None
-        if key in self._var_headers_dict:
-            var_header = self._var_headers_dict[key]
-            fmt = VAR_TYPE_MAP[var_header.type] * var_header.count
-            var_offset = var_header.offset + self._header.var_buf[0].buf_offset + index * self._header.buf_len
-            res = struct.unpack_from(fmt, self._shared_mem, var_offset)
-            return list(res) if var_header.count > 1 else res[0]
+        var_decoder = self._var_decoders.get(key)
+        if var_decoder is not None:
+            return var_decoder.decode(self._shared_mem, self._header.var_buf[0].buf_offset + index * self._header.buf_len)
         return None
 
     def get_all(self, key):
@@ -734,6 +1568,8 @@ class IBT:
             return None
         if key in self._var_headers_dict:
             var_header = self._var_headers_dict[key]
+            if np is not None and var_header.type != 0 and var_header.count == 1:
+                return self.get_array(key).tolist()
             fmt = VAR_TYPE_MAP[var_header.type] * var_header.count
             var_offset = var_header.offset + self._header.var_buf[0].buf_offset
             buf_len = self._header.buf_len
@@ -745,15 +1581,48 @@ class IBT:
             return results
         return None
 
+    def get_array(self, key):
+        # zero-copy view over all records (2-D for array vars), every record is buf_len apart
+        # drop returned arrays before close(), mmap can't be closed while they point into it
+        if not self._header:
+            return None
+        if np is None:
+            raise ImportError('numpy is required for var buffer arrays')
+        if key in self._var_headers_dict:
+            var_header = self._var_headers_dict[key]
+            dtype = np.dtype(VAR_TYPE_NP_MAP[var_header.type])
+            shape = (self._disk_header.session_record_count,)
+            strides = (self._header.buf_len,)
+            if var_header.count > 1:
+                shape += (var_header.count,)
+                strides += (dtype.itemsize,)
+            return np.ndarray(shape, dtype, buffer=self._shared_mem,
+                offset=self._header.var_buf[0].buf_offset + var_header.offset, strides=strides)
+        return None
+
+    def get_columns(self, keys, start=None, stop=None, step=None):
+        # several vars for a range of records copied out in one pass, step decimates
+        # chunks keep both source records and copied rows in cache while all fields are copied
+        if not self._header:
+            return None
+        if np is None:
+            raise ImportError('numpy is required for var buffer arrays')
+        keys = list(dict.fromkeys(keys))
+        known_keys = [key for key in keys if key in self._var_headers_dict]
+        records = np.ndarray((self._disk_header.session_record_count,), self._var_dtype,
+            buffer=self._shared_mem, offset=self._header.var_buf[0].buf_offset)[start:stop:step][known_keys]
+        columns = np.empty(len(records), np.dtype([(key, self._var_dtype.fields[key][0]) for key in known_keys]))
+        for i in range(0, len(records), IBT_CHUNK_RECORDS):
+            columns[i : i + IBT_CHUNK_RECORDS] = records[i : i + IBT_CHUNK_RECORDS]
+        del records
+        return {key: columns[key] if key in known_keys else None for key in keys}
+
     @property
     def _var_headers(self):
         if not self._header:
             return None
         if self.__var_headers is None:
-            self.__var_headers = []
-            for i in range(self._header.num_vars):
-                var_header = VarHeader(self._shared_mem, self._header.var_header_offset + i * 144)
-                self._var_headers.append(var_header)
+            self.__var_headers = VarHeader.parse_table(self._shared_mem, self._header.var_header_offset, self._header.num_vars)
         return self.__var_headers
 
     @property
@@ -766,6 +1635,217 @@ class IBT:
                 self.__var_headers_dict[var_header.name] = var_header
         return self.__var_headers_dict
 
+    def _build_lap_index(self):
+        record_count = self._disk_header.session_record_count
+        if 'Lap' not in self._var_headers_dict or record_count == 0:
+            return []
+        if np is not None:
+            boundaries = (np.flatnonzero(np.diff(self.get_array('Lap'))) + 1).tolist()
+        else:
+            laps = self.get_all('Lap')
+            boundaries = [i for i in range(1, record_count) if laps[i] != laps[i - 1]]
+        has_lap_completed = 'LapCompleted' in self._var_headers_dict
+
+        lap_index = []
+        for start, stop in zip([0] + boundaries, boundaries + [record_count]):
+            lap = self.get(start, 'Lap')
+            end_time = self.get(min(stop, record_count - 1), 'SessionTime')
+            # only laps recorded from line to line, with sim counting them as completed
+            valid = start > 0 and stop < record_count and self.get(stop, 'Lap') == lap + 1 and \
+                (not has_lap_completed or self.get(stop, 'LapCompleted') >= lap)
+            lap_index.append(LapInfo(lap, start, stop, end_time - self.get(start, 'SessionTime'), valid))
+        return lap_index
+
+    def _lap_index_key(self):
+        stat = os.fstat(self._ibt_file.fileno())
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load_lap_index(self):
+        try:
+            with open(self.file_name + '.laps', 'r') as f:
+                cached = json.load(f)
+            if cached['key'] == self._lap_index_key():
+                return [LapInfo(*lap_info) for lap_info in cached['laps']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_lap_index(self, lap_index):
+        try:
+            with open(self.file_name + '.laps', 'w') as f:
+                json.dump(dict(key=self._lap_index_key(), laps=lap_index), f)
+        except OSError:
+            # read only telemetry folder, just rebuild next time
+            pass
+
+    @property
+    def _var_dtype(self):
+        if not self._header:
+            return None
+        if self.__var_dtype is None:
+            self.__var_dtype = var_headers_dtype(self._var_headers, self._header.buf_len)
+        return self.__var_dtype
+
+    @property
+    def _var_decoders(self):
+        if not self._header:
+            return None
+        if self.__var_decoders is None:
+            self.__var_decoders = {
+                var_header.name: VarDecoder(var_header)
+                for var_header in self._var_headers
+            }
+        return self.__var_decoders
+
+class IRSDKReplay:
+    # plays ibt file (or IRSDKRecorder recording) into file backed memory laid out like sim's,
+    # IRSDK().startup(test_file=mem_file) then sees telemetry moving like in a live session.
+    # overlays have to be started that way too, the pip irsdk they import only knows sim's memory
+    def __init__(self, ibt_file, mem_file, speed=1.0, loop=False, num_buf=3):
+        self.speed = speed  # 1.0 is real time, None is as fast as possible
+        self.loop = loop
+        self.record = 0
+        self.tick_count = 0
+
+        self.ibt = IBT()
+        self.ibt.open(ibt_file)
+        header = self.ibt._header
+        self._buf_len = header.buf_len
+        self._tick_rate = header.tick_rate
+        self._record_count = self.ibt._disk_header.session_record_count
+        self._records_offset = header.var_buf[0].buf_offset
+        if self._record_count == 0:
+            self.ibt.close()
+            raise ValueError('No records in {}'.format(ibt_file))
+
+        var_headers_len = header.num_vars * 144
+        session_info_offset = IBT_VAR_HEADERS_OFFSET + var_headers_len
+        self._buf_offsets = [session_info_offset + header.session_info_len + i * self._buf_len for i in range(num_buf)]
+        self._src = memoryview(self.ibt._shared_mem)
+
+        mem = bytearray(self._buf_offsets[-1] + self._buf_len)
+        struct.pack_into('=10i', mem, 0, header.version, StatusField.status_connected, self._tick_rate, 1, header.session_info_len,
+                         session_info_offset, header.num_vars, IBT_VAR_HEADERS_OFFSET, num_buf, self._buf_len)
+        mem[IBT_VAR_HEADERS_OFFSET : session_info_offset] = self._src[header.var_header_offset : header.var_header_offset + var_headers_len]
+        mem[session_info_offset : session_info_offset + header.session_info_len] = \
+            self._src[header.session_info_offset : header.session_info_offset + header.session_info_len]
+        # every var buffer starts with first record, so readers have valid data right after startup
+        for i, buf_offset in enumerate(self._buf_offsets):
+            struct.pack_into('=2i', mem, 48 + i * 16, 0, buf_offset)
+            mem[buf_offset : buf_offset + self._buf_len] = self._src[self._records_offset : self._records_offset + self._buf_len]
+        with open(mem_file, 'wb') as f:
+            f.write(mem)
+        self._mem_file = open(mem_file, 'r+b')
+        self._mem = mmap.mmap(self._mem_file.fileno(), 0)
+
+    def step(self):
+        if self.record >= self._record_count:
+            if not self.loop:
+                return False
+            self.record = 0
+        # same round robin as sim, record goes into the buffer after the newest one
+        self.tick_count += 1
+        var_buf = self.tick_count % len(self._buf_offsets)
+        buf_offset = self._buf_offsets[var_buf]
+        src_offset = self._records_offset + self.record * self._buf_len
+        self._mem[buf_offset : buf_offset + self._buf_len] = self._src[src_offset : src_offset + self._buf_len]
+        # tick count last, readers pick buffers by it
+        struct.pack_into('=i', self._mem, 48 + var_buf * 16, self.tick_count)
+        self.record += 1
+        return True
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            ticks = 0
+            while self.step():
+                ticks += 1
+                if self.speed:
+                    # sleep against schedule, not per tick, so coarse sleeps don't make replay drift
+                    delay = start + ticks / (self._tick_rate * self.speed) - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._mem:
+            return
+        # readers see sim as disconnected
+        struct.pack_into('=i', self._mem, 4, 0)
+        self._mem.close()
+        self._mem_file.close()
+        self._src.release()
+        self.ibt.close()
+        self._mem = None
+
+def _ibt_channel_max(ibt, key):
+    if key not in ibt.var_headers_names or ibt._disk_header.session_record_count == 0:
+        return None
+    if np is not None:
+        return ibt.get_array(key).max().item()
+    return max(ibt.get_all(key))
+
+def summarize_ibt(file_name):
+    # runs in worker process, only touches lap boundaries and a few whole channels
+    stat = os.stat(file_name)
+    ibt = IBT()
+    ibt.open(file_name)
+    try:
+        valid_laps = [lap_info for lap_info in ibt.laps if lap_info.valid]
+        best_lap = min(valid_laps, key=lambda lap_info: lap_info.lap_time, default=None)
+        fuel_used = []
+        if 'FuelLevel' in ibt.var_headers_names:
+            fuel_used = [ibt.get(lap_info.start, 'FuelLevel') - ibt.get(lap_info.stop, 'FuelLevel') for lap_info in valid_laps]
+            fuel_used = [fuel for fuel in fuel_used if fuel > 0]  # laps with refuel in them
+        max_speed = _ibt_channel_max(ibt, 'Speed')
+        return dict(
+            file_name=file_name,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            records=ibt._disk_header.session_record_count,
+            laps=len(valid_laps),
+            best_lap=best_lap.lap if best_lap else None,
+            best_lap_time=round(best_lap.lap_time, 3) if best_lap else None,
+            fuel_per_lap=round(sum(fuel_used) / len(fuel_used), 3) if fuel_used else None,
+            max_speed=round(max_speed, 3) if max_speed is not None else None,
+            incidents=_ibt_channel_max(ibt, 'PlayerCarMyIncidentCount'),
+        )
+    finally:
+        ibt.close()
+
+def summarize_ibt_dir(path, summary_file, workers=None):
+    # rows are appended as files finish, so an interrupted run picks up where it stopped.
+    # files changed since they were summarized get a new row, last row for a file wins
+    done = set()
+    if os.path.exists(summary_file):
+        with open(summary_file, newline='') as f:
+            done = {(row['file_name'], row['size'], row['mtime_ns']) for row in csv.DictReader(f)}
+
+    file_names = []
+    # rows are keyed by absolute path, so other spellings of the same directory don't summarize it again
+    for root, dirs, files in os.walk(os.path.abspath(path)):
+        for name in sorted(files):
+            if name.lower().endswith('.ibt'):
+                file_name = os.path.join(root, name)
+                stat = os.stat(file_name)
+                if (file_name, str(stat.st_size), str(stat.st_mtime_ns)) not in done:
+                    file_names.append(file_name)
+
+    with open(summary_file, 'a', newline='') as f, ProcessPoolExecutor(workers) as executor:
+        writer = csv.DictWriter(f, IBT_SUMMARY_FIELDS)
+        if f.tell() == 0:
+            writer.writeheader()
+        futures = {executor.submit(summarize_ibt, file_name): file_name for file_name in file_names}
+        for future in as_completed(futures):
+            try:
+                writer.writerow(future.result())
+                f.flush()
+            except Exception as e:
+                # not written, so it's retried next run
+                print('Failed to summarize {}: {}'.format(futures[future], e))
+    return len(file_names)
+
 # https://stackoverflow.com/a/37958106/1034242
 class CustomYamlSafeLoader(YamlSafeLoader):
     @classmethod
@@ -776,19 +1856,176 @@ class CustomYamlSafeLoader(YamlSafeLoader):
             cls.yaml_implicit_resolvers[first_letter] = [(tag, regexp) for tag, regexp in mappings if tag != tag_to_remove]
 CustomYamlSafeLoader.remove_implicit_resolver('tag:yaml.org,2002:timestamp')
 
+def load_session_info_yaml(yaml_src, key):
+    # PyYAML path for any section, with the quoting fixes sim's output needs
+    if key == 'DriverInfo':
+        def name_replace(m):
+            return m.group(1) + '"%s"' % re.sub(r'(["\\])', r'\\\1', m.group(2))
+        yaml_src = re.sub(r'((?:DriverSetupName|UserName|TeamName|AbbrevName|Initials): )(.*)', name_replace, yaml_src)
+    yaml_src = re.sub(r'(\w+: )(,.*)', r'\1"\2"', yaml_src)
+    return yaml.load(yaml_src, Loader=CustomYamlSafeLoader)
+
+YAML_LINE_RE = re.compile(r'([A-Za-z_]\w*):(?: (.*))?$')
+YAML_INT_RE = re.compile(r'[-+]?(?:0|[1-9][0-9]*|0x[0-9a-fA-F]+)$')
+YAML_FLOAT_RE = re.compile(r'[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+][0-9]+)?$')
+YAML_BOOL_VALUES = {'yes': True, 'no': False, 'true': True, 'false': False, 'on': True, 'off': False}
+
+def _parse_session_info_scalar(value):
+    # plain or double quoted scalar, typed the way CustomYamlSafeLoader would
+    value = value.strip(' ')
+    if not value:
+        return None
+    first = value[0]
+    if first == '"':
+        if len(value) < 2 or value[-1] != '"' or '"' in value[1:-1] or '\\' in value:
+            raise ValueError(value)
+        return value[1:-1]
+    if first in '-?:,[]{}#&*!|>\'%@`' and not (first == '-' and len(value) > 1 and value[1] != ' '):
+        raise ValueError(value)
+    if ' #' in value or ': ' in value or value[-1] == ':':
+        raise ValueError(value)
+    for tag, regexp in CustomYamlSafeLoader.yaml_implicit_resolvers.get(first, ()):
+        if regexp.match(value):
+            if tag == 'tag:yaml.org,2002:int' and YAML_INT_RE.match(value):
+                return int(value, 16) if 'x' in value else int(value)
+            if tag == 'tag:yaml.org,2002:float' and YAML_FLOAT_RE.match(value):
+                return float(value)
+            if tag == 'tag:yaml.org,2002:bool':
+                return YAML_BOOL_VALUES[value.lower()]
+            if tag == 'tag:yaml.org,2002:null':
+                return None
+            # underscores, octal, sexagesimal, inf/nan, merge keys...
+            raise ValueError(value)
+    return value
+
+def parse_session_info(yaml_src, key):
+    # block mappings and sequences of plain scalars, which is all iRacing writes to session info
+    # raises ValueError for anything else, caller falls back to PyYAML
+    if '\t' in yaml_src or '\r' in yaml_src:
+        raise ValueError('tabs or carriage returns')
+    lines = []
+    for line in yaml_src.split('\n'):
+        content = line.lstrip(' ')
+        if content:
+            if content[0] == '#':
+                raise ValueError(line)
+            lines.append([len(line) - len(content), content])
+    raw_keys = YAML_DRIVER_NAME_KEYS if key == 'DriverInfo' else ()
+    pos = 0
+    # keys and many values repeat for every driver, typed scalars are immutable so share them
+    scalars = {}
+
+    def parse_scalar(value):
+        if value in scalars:
+            return scalars[value]
+        scalar = scalars[value] = _parse_session_info_scalar(value)
+        return scalar
+
+    def parse_node(indent):
+        # node made of lines indented deeper than parent
+        if pos >= len(lines) or lines[pos][0] < indent:
+            return None
+        line_indent, content = lines[pos]
+        if content == '-' or content.startswith('- '):
+            return parse_sequence(line_indent)
+        return parse_mapping(line_indent)
+
+    def parse_mapping(indent):
+        nonlocal pos
+        mapping = {}
+        while pos < len(lines):
+            line_indent, content = lines[pos]
+            if line_indent != indent:
+                if line_indent < indent:
+                    break
+                raise ValueError(content)
+            # sequence items and anything but simple keys don't match
+            match = YAML_LINE_RE.match(content)
+            if not match:
+                raise ValueError(content)
+            raw_key, value = match.groups()
+            map_key = parse_scalar(raw_key)
+            pos += 1
+            if value is not None and raw_keys and raw_key.endswith(raw_keys):
+                # written unquoted by sim but always meant as text
+                mapping[map_key] = value
+            elif value and value[0] == ',':
+                mapping[map_key] = value
+            elif value and value.strip(' '):
+                mapping[map_key] = parse_scalar(value)
+            elif pos < len(lines) and lines[pos][0] == indent and (lines[pos][1] == '-' or lines[pos][1].startswith('- ')):
+                # sequences may start at same indent as their key
+                mapping[map_key] = parse_sequence(indent)
+            else:
+                mapping[map_key] = parse_node(indent + 1)
+        return mapping
+
+    def parse_sequence(indent):
+        nonlocal pos
+        sequence = []
+        while pos < len(lines):
+            line_indent, content = lines[pos]
+            if line_indent < indent or not (content == '-' or content.startswith('- ')):
+                if line_indent > indent:
+                    raise ValueError(content)
+                break
+            if line_indent > indent:
+                raise ValueError(content)
+            item = content[1:].lstrip(' ')
+            if not item:
+                pos += 1
+                sequence.append(parse_node(indent + 1))
+            elif item == '-' or item.startswith('- ') or item[0] == '"' or not YAML_LINE_RE.match(item):
+                if ': ' in item or item.startswith('- '):
+                    raise ValueError(content)
+                pos += 1
+                sequence.append(parse_scalar(item))
+            else:
+                # mapping starting on the dash line, rest of its keys line up with first one
+                lines[pos] = [line_indent + len(content) - len(item), item]
+                sequence.append(parse_mapping(lines[pos][0]))
+        return sequence
+
+    result = parse_mapping(0)
+    if pos != len(lines) or list(result) != [key]:
+        raise ValueError('unexpected document layout')
+    return result[key]
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('-v', '--version', action='version', version='Python iRacing SDK %s' % VERSION, help='show version and exit')
-    parser.add_argument('--test', help='use test file as irsdk mmap')
+    parser.add_argument('--test', default=os.environ.get(TEST_FILE_ENV), help='use test file as irsdk mmap, defaults to $%s' % TEST_FILE_ENV)
     parser.add_argument('--dump', help='dump irsdk mmap to file')
     parser.add_argument('--parse', help='parse current irsdk mmap to file')
+    parser.add_argument('--hub', help='publish comma separated vars to shared memory for overlays')
+    parser.add_argument('--record', help='record telemetry at full tick rate to ibt file')
+    parser.add_argument('--replay', help='replay ibt file into --test file, read it with IRSDK().startup(test_file=...)')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed, 0 for as fast as possible')
+    parser.add_argument('--loop', action='store_true', help='restart replay at end of file')
+    parser.add_argument('--batch', help='summarize all ibt files in directory')
+    parser.add_argument('--summary', default='ibt_summary.csv', help='summary table for --batch, resumed if it exists')
+    parser.add_argument('--workers', type=int, help='worker processes for --batch, defaults to cpu count')
     args = parser.parse_args()
 
+    if args.batch:
+        summarize_ibt_dir(args.batch, args.summary, args.workers)
+        return
+
+    if args.replay:
+        IRSDKReplay(args.replay, args.test or 'irsdk_replay.bin', args.speed, args.loop).run()
+        return
+
     ir = IRSDK()
     ir.startup(test_file=args.test, dump_to=args.dump)
 
     if args.parse:
         ir.parse_to(args.parse)
 
+    if args.hub and ir.is_initialized:
+        IRSDKHub(ir, args.hub.split(',')).run()
+
+    if args.record and ir.is_initialized:
+        IRSDKRecorder(ir, args.record).run()
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
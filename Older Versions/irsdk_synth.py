@@ -0,0 +1,336 @@
+#!python3
+# synthetic sim memory for load tests beyond what sim produces, see --help
+
+import os
+import math
+import time
+import mmap
+import struct
+import argparse
+import importlib.util
+
+# sdk file name isn't importable, load it from next to this script
+SDK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '#!python3.py')
+_spec = importlib.util.spec_from_file_location('irsdk', SDK_FILE)
+irsdk = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(irsdk)
+
+SYNTH_BITFIELD_UNITS = ('irsdk_Flags', 'irsdk_EngineWarnings', 'irsdk_CameraState', 'irsdk_PitSvFlags', 'irsdk_PaceFlags')
+SYNTH_DOUBLE_VARS = ('SessionTime', 'SessionTimeRemain', 'ReplaySessionTime')
+SYNTH_MAX_CARS = 64
+SYNTH_BASE_FRAMES = 32
+
+def read_vars_file(vars_file):
+    # "Name   description, unit" lines as in vars.txt, var type and count are guessed from them
+    var_specs = {}
+    with open(vars_file, 'r', encoding='latin-1') as f:
+        for line in f:
+            parts = line.split(None, 1)
+            if not parts:
+                continue
+            name = parts[0]
+            desc = parts[1].strip() if len(parts) > 1 else ''
+            desc, unit = desc.rsplit(',', 1) if ',' in desc else (desc, '')
+            unit = unit.strip()
+            if name in SYNTH_DOUBLE_VARS:
+                var_type = 5
+            elif unit in SYNTH_BITFIELD_UNITS:
+                var_type = 3
+            elif unit.startswith('irsdk_'):
+                var_type = 2
+            elif desc.lower().startswith(('true if', '1=')) or name.endswith('_OK'):
+                var_type = 1
+            elif not unit:
+                var_type = 2
+            else:
+                var_type = 4
+            count = SYNTH_MAX_CARS if name.startswith('CarIdx') else 6 if name.endswith('_ST') else 1
+            var_specs[name] = (var_type, count, desc, unit)
+    return var_specs
+
+def synthetic_session_info(cars, update):
+    # same sections and shape as sim's session info, results rotate on every update
+    lines = ['---', 'WeekendInfo:', ' TrackName: synthetic', ' TrackID: 1', ' TrackLength: 6.93 km',
+             ' TrackDisplayName: Synthetic Circuit', ' TrackNumTurns: 20', ' TrackType: road course',
+             ' TrackSurfaceTemp: 35.49 C', ' TrackAirTemp: 22.81 C', ' EventType: Race', ' Category: Road',
+             ' NumCarClasses: 1', ' WeekendOptions:', '  NumStarters: %d' % cars, '  StartingGrid: single file', '',
+             'SessionInfo:', ' Sessions:', ' - SessionNum: 0', '   SessionLaps: unlimited', '   SessionTime: 3600.0000 sec',
+             '   SessionType: Race', '   SessionName: RACE', '   ResultsPositions:']
+    for position in range(cars):
+        lines += ['   - Position: %d' % (position + 1), '     ClassPosition: %d' % position,
+                  '     CarIdx: %d' % ((position + update) % cars), '     Lap: %d' % update,
+                  '     Time: %.4f' % (90 + position * 0.1 + update), '     FastestLap: %d' % max(1, update),
+                  '     FastestTime: 90.1234', '     LastTime: %.4f' % (90.5 + position * 0.01),
+                  '     LapsComplete: %d' % update, '     Incidents: %d' % ((position + update // 8) % 5),
+                  '     ReasonOutStr: Running']
+    lines += ['   ResultsAverageLapTime: -1.0000', '   ResultsOfficial: 0', '',
+              'DriverInfo:', ' DriverCarIdx: 0', ' DriverUserID: 100000', ' PaceCarIdx: -1',
+              ' DriverCarIdleRPM: 900.000', ' DriverCarRedLine: 7500.000', ' DriverCarSLShiftRPM: 7000.000',
+              ' DriverIncidentCount: %d' % (update // 8 % 5), ' Drivers:']
+    for car_idx in range(cars):
+        lines += [' - CarIdx: %d' % car_idx, '   UserName: Driver %d' % car_idx, '   AbbrevName: Driver, %d' % car_idx,
+                  '   Initials: D%d' % car_idx, '   UserID: %d' % (100000 + car_idx), '   TeamName: Team %d' % car_idx,
+                  '   CarNumber: "%d"' % car_idx, '   CarNumberRaw: %d' % car_idx, '   CarPath: synthetic',
+                  '   CarClassID: 1', '   CarID: 1', '   CarIsPaceCar: 0', '   CarScreenName: Synthetic Car',
+                  '   CarClassShortName: SYN', '   CarClassColor: 0xffffff', '   CarClassEstLapTime: 90.1234',
+                  '   IRating: %d' % (1350 + car_idx * 17), '   LicLevel: 12', '   LicSubLevel: 349',
+                  '   LicString: C 3.49', '   LicColor: 0xfeec04', '   IsSpectator: 0',
+                  '   CurDriverIncidentCount: %d' % ((car_idx + update // 8) % 5)]
+    lines += ['', 'SplitTimeInfo:', ' Sectors:', ' - SectorNum: 0', '   SectorStartPct: 0.000000',
+              ' - SectorNum: 1', '   SectorStartPct: 0.500000', '', '...', '']
+    return '\n'.join(lines).encode(irsdk.YAML_CODE_PAGE)
+
+class IRSDKSynth:
+    # animates synthetic sim memory with every var from vars.txt, for load tests beyond what sim produces
+    # IRSDK().startup(test_file=mem_file) reads it, like IRSDKReplay
+    def __init__(self, mem_file, tick_rate=60, cars=SYNTH_MAX_CARS, vars_file=None, session_info_interval=1.0, num_buf=3, lap_time=90.0):
+        self.tick_rate = tick_rate
+        self.cars = min(cars, SYNTH_MAX_CARS)
+        self.session_info_interval = session_info_interval
+        self.lap_time = lap_time
+        self.tick_count = 0
+        self.session_info_update = 1
+
+        var_specs = read_vars_file(vars_file or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vars.txt'))
+        layout = []
+        buf_len = 0
+        for name, (var_type, count, desc, unit) in var_specs.items():
+            layout.append((name, var_type, count, buf_len))
+            buf_len += irsdk.VAR_TYPE_SIZE[var_type] * count
+        self._buf_len = buf_len
+        self._offsets = {name: (var_type, count, offset) for name, var_type, count, offset in layout}
+        self._var_structs = {
+            name: struct.Struct('=' + irsdk.VAR_TYPE_MAP[var_type] * count)
+            for name, var_type, count, offset in layout
+        }
+
+        session_info = synthetic_session_info(self.cars, self.session_info_update)
+        # room for results to grow, sim also keeps session info in fixed size block
+        self._session_info_len = (len(session_info) * 2 + 4095) // 4096 * 4096
+        self._session_info_offset = irsdk.IBT_VAR_HEADERS_OFFSET + len(layout) * 144
+        self._buf_offsets = [self._session_info_offset + self._session_info_len + i * buf_len for i in range(num_buf)]
+
+        mem = bytearray(self._buf_offsets[-1] + buf_len)
+        struct.pack_into('=10i', mem, 0, 2, irsdk.StatusField.status_connected, tick_rate, self.session_info_update, self._session_info_len,
+                         self._session_info_offset, len(layout), irsdk.IBT_VAR_HEADERS_OFFSET, num_buf, buf_len)
+        for i, (name, var_type, count, offset) in enumerate(layout):
+            desc, unit = var_specs[name][2:]
+            struct.pack_into('=3i?3x32s64s32s', mem, irsdk.IBT_VAR_HEADERS_OFFSET + i * 144, var_type, offset, count, False,
+                             name.encode('latin-1'), desc.encode('latin-1')[:63], unit.encode('latin-1')[:31])
+        mem[self._session_info_offset : self._session_info_offset + len(session_info)] = session_info
+        for i, buf_offset in enumerate(self._buf_offsets):
+            struct.pack_into('=2i', mem, 48 + i * 16, 0, buf_offset)
+
+        # vars without physics below get slowly cycling values, rendered once into a few base frames
+        buf_struct = struct.Struct('=' + ''.join(irsdk.VAR_TYPE_MAP[var_type] * count for name, var_type, count, offset in layout))
+        self._base_frames = []
+        for frame in range(SYNTH_BASE_FRAMES):
+            phase = 2 * math.pi * frame / SYNTH_BASE_FRAMES
+            values = []
+            for i, (name, var_type, count, offset) in enumerate(layout):
+                if var_type >= 4:
+                    value = (10 + i % 50) * (1 + 0.05 * math.sin(phase + i))
+                elif var_type == 3:
+                    value = 0
+                elif var_type == 2:
+                    value = (frame + i) % 4
+                else:
+                    value = (frame + i) % 16 == 0
+                values += [value] * count
+            self._base_frames.append(buf_struct.pack(*values))
+
+        with open(mem_file, 'wb') as f:
+            f.write(mem)
+        self._mem_file = open(mem_file, 'r+b')
+        self._mem = mmap.mmap(self._mem_file.fileno(), 0)
+        self._next_session_info_time = session_info_interval
+        self.step()
+
+    def step(self):
+        self.tick_count += 1
+        session_time = self.tick_count / self.tick_rate
+        var_buf = self.tick_count % len(self._buf_offsets)
+        buf_offset = self._buf_offsets[var_buf]
+        self._mem[buf_offset : buf_offset + self._buf_len] = self._base_frames[self.tick_count % SYNTH_BASE_FRAMES]
+        for name, value in self._animate(session_time).items():
+            var_struct = self._var_structs.get(name)
+            if var_struct is not None:
+                if var_struct.size > irsdk.VAR_TYPE_SIZE[self._offsets[name][0]]:
+                    var_struct.pack_into(self._mem, buf_offset + self._offsets[name][2], *value)
+                else:
+                    var_struct.pack_into(self._mem, buf_offset + self._offsets[name][2], value)
+        # tick count last, readers pick buffers by it
+        struct.pack_into('=i', self._mem, 48 + var_buf * 16, self.tick_count)
+
+        if self.session_info_interval and session_time >= self._next_session_info_time:
+            self._next_session_info_time += self.session_info_interval
+            self.update_session_info()
+        return True
+
+    def update_session_info(self):
+        self.session_info_update += 1
+        session_info = synthetic_session_info(self.cars, self.session_info_update)[:self._session_info_len]
+        start = self._session_info_offset
+        self._mem[start : start + self._session_info_len] = session_info.ljust(self._session_info_len, b'\x00')
+        struct.pack_into('=i', self._mem, 12, self.session_info_update)
+
+    def _animate(self, session_time):
+        # player car laps a track with 7 corners, other cars run slightly different pace
+        laps, lap_dist_pct = divmod(session_time / self.lap_time, 1.0)
+        corner = 2 * math.pi * 7 * lap_dist_pct
+        accel = math.cos(corner)
+        speed = 45 + 25 * math.sin(corner)
+        gear = min(6, 1 + int(speed / 12))
+        values = dict(
+            SessionTime=session_time,
+            SessionTick=self.tick_count,
+            Lap=int(laps) + 1,
+            LapCompleted=int(laps),
+            LapDistPct=lap_dist_pct,
+            LapDist=lap_dist_pct * 6930,
+            LapCurrentLapTime=lap_dist_pct * self.lap_time,
+            Speed=speed,
+            Gear=gear,
+            RPM=3500 + (speed % 12) / 12 * 4000,
+            Throttle=min(1.0, max(0.0, 0.3 + accel)),
+            Brake=min(1.0, max(0.0, -0.3 - accel)),
+            LongAccel=accel * 8,
+            LatAccel=math.sin(corner + math.pi / 2) * 15,
+            SteeringWheelAngle=math.sin(corner + math.pi / 2) * 0.8,
+            FuelLevel=max(0.0, 50 - session_time * 0.03),
+        )
+        cars = self.cars
+        progress = [session_time / (self.lap_time * (1 + 0.004 * car_idx)) - car_idx * 0.01 for car_idx in range(cars)]
+        order = sorted(range(cars), key=lambda car_idx: -progress[car_idx])
+        positions = [0] * SYNTH_MAX_CARS
+        for position, car_idx in enumerate(order):
+            positions[car_idx] = position + 1
+        empty = [-1] * (SYNTH_MAX_CARS - cars)
+        car_pct = [p % 1.0 for p in progress]
+        values.update(
+            CarIdxLapDistPct=car_pct + empty,
+            CarIdxLap=[int(p) + 1 for p in progress] + empty,
+            CarIdxLapCompleted=[int(p) for p in progress] + empty,
+            CarIdxEstTime=[pct * self.lap_time for pct in car_pct] + empty,
+            CarIdxPosition=positions,
+            CarIdxClassPosition=positions,
+            CarIdxRPM=[3500 + 4000 * abs(math.sin(pct * 44)) for pct in car_pct] + empty,
+            CarIdxGear=[1 + int(pct * 30) % 6 for pct in car_pct] + empty,
+            CarIdxTrackSurface=[3] * cars + empty,
+        )
+        return values
+
+    def run(self, seconds=None):
+        try:
+            start = time.perf_counter()
+            ticks = 0
+            while seconds is None or ticks < seconds * self.tick_rate:
+                self.step()
+                ticks += 1
+                delay = start + ticks / self.tick_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._mem:
+            return
+        struct.pack_into('=i', self._mem, 4, 0)
+        self._mem.close()
+        self._mem_file.close()
+        self._mem = None
+
+def synth_stress_report(mem_file, tick_rates=(60, 360, 1000), cars=SYNTH_MAX_CARS, seconds=2.0, vars_file=None, session_info_ticks=1):
+    # runs generator, IRSDK decode, session info yaml and a standings render in one loop per tick rate
+    # and reports what each stage costs and which one runs out of tick budget first.
+    # session info is rewritten every session_info_ticks ticks, so yaml load grows with tick rate like the rest
+    try:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import pygame
+        pygame.init()
+        font = pygame.font.SysFont('Arial', 14)
+        surface = pygame.Surface((400, 16 * cars + 100))
+    except ImportError:
+        pygame = None
+
+    def render(frame):
+        surface.fill((0, 0, 0))
+        pygame.draw.arc(surface, (255, 0, 0), (10, 10, 80, 80), 0, math.pi * frame.RPM / 8000, 5)
+        surface.blit(font.render('%d' % frame.Gear, True, (255, 255, 255)), (45, 40))
+        order = sorted(range(cars), key=lambda car_idx: frame.CarIdxPosition[car_idx])
+        for row, car_idx in enumerate(order):
+            surface.blit(font.render('P%d  #%d  %.1f' % (row + 1, car_idx, frame.CarIdxEstTime[car_idx]), True, (255, 255, 255)), (10, 100 + row * 16))
+
+    results = []
+    for tick_rate in tick_rates:
+        synth = IRSDKSynth(mem_file, tick_rate, cars, vars_file, session_info_interval=0)
+        ir = irsdk.IRSDK()
+        ir.startup(test_file=mem_file)
+        names = ir.var_headers_names
+        costs = dict(generate=0.0, decode=0.0, yaml=0.0, render=0.0)
+        ticks = yaml_updates = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            t0 = time.perf_counter()
+            update = synth.session_info_update
+            synth.step()
+            if synth.tick_count % session_info_ticks == 0:
+                synth.update_session_info()
+            t1 = time.perf_counter()
+            ir.freeze_var_buffer_latest()
+            frame = ir.snapshot(names)
+            t2 = time.perf_counter()
+            if synth.session_info_update != update:
+                ir['SessionInfo']
+                ir['DriverInfo']
+                yaml_updates += 1
+            t3 = time.perf_counter()
+            if pygame:
+                render(frame)
+            t4 = time.perf_counter()
+            costs['generate'] += t1 - t0
+            costs['decode'] += t2 - t1
+            costs['yaml'] += t3 - t2
+            costs['render'] += t4 - t3
+            ticks += 1
+            # pace like a real tick source, no sleep once behind
+            delay = start + ticks / tick_rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        elapsed = time.perf_counter() - start
+        ir.shutdown()
+        synth.close()
+        results.append((tick_rate, ticks / elapsed, {stage: cost / elapsed for stage, cost in costs.items()}))
+
+    stages = ('generate', 'decode', 'yaml', 'render') if pygame else ('generate', 'decode', 'yaml')
+    print('%d vars, %d cars, session info every %d ticks' % (len(names), cars, session_info_ticks))
+    print('%8s %10s  %s' % ('tick hz', 'achieved', '  '.join('%9s' % stage for stage in stages)))
+    for tick_rate, achieved, load in results:
+        print('%8d %10.1f  %s' % (tick_rate, achieved, '  '.join('%8.1f%%' % (load[stage] * 100) for stage in stages)))
+    for tick_rate, achieved, load in results:
+        if achieved < tick_rate * 0.98:
+            print('saturated at %d Hz, %s takes most of the tick budget' % (tick_rate, max(stages, key=load.get)))
+            break
+    else:
+        print('no tick rate saturated, %s takes most of the tick budget' % max(stages, key=results[-1][2].get))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--test', default=os.environ.get(irsdk.TEST_FILE_ENV, 'irsdk_synth.bin'), help='synthetic irsdk mmap file, defaults to $%s' % irsdk.TEST_FILE_ENV)
+    parser.add_argument('--hz', type=int, default=60, help='tick rate')
+    parser.add_argument('--cars', type=int, default=SYNTH_MAX_CARS, help='car count')
+    parser.add_argument('--vars', help='vars.txt to take var names from, defaults to the one next to this script')
+    parser.add_argument('--stress', action='store_true', help='report which stage saturates first at 60, 360 and 1000 Hz')
+    parser.add_argument('--session-info-ticks', type=int, default=1, help='with --stress, rewrite session info every this many ticks')
+    args = parser.parse_args()
+
+    if args.stress:
+        synth_stress_report(args.test, cars=args.cars, vars_file=args.vars, session_info_ticks=args.session_info_ticks)
+        return
+
+    IRSDKSynth(args.test, args.hz, args.cars, args.vars).run()
+
+if __name__ == '__main__':
+    main()
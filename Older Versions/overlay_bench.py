@@ -0,0 +1,128 @@
+#!python3
+# runs an overlay headless against a test file and reports pixels pushed and CPU, see --help
+#
+# overlays import win32gui and the pip irsdk package and call ir.startup() without a test file,
+# so they can't run off a test file by themselves. This stubs the win32 modules, serves the
+# vendored sdk as irsdk and points startup() at the test file. Overlay code itself runs as it is.
+# Start irsdk_synth.py on the same file first for a racing load, leave it out for a static one.
+
+import os
+import sys
+import time
+import types
+import runpy
+import argparse
+import importlib.util
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+SDK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '#!python3.py')
+
+class Done(Exception):
+    pass
+
+class Win32Stub(types.ModuleType):
+    # window handles and styles don't exist under the dummy video driver
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: 0
+
+def load_sdk(test_file):
+    spec = importlib.util.spec_from_file_location('irsdk', SDK_FILE)
+    irsdk = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(irsdk)
+    sdk_startup = irsdk.IRSDK.startup
+    default_test_file = test_file
+
+    def startup(self, test_file=None, dump_to=None):
+        return sdk_startup(self, test_file or default_test_file, dump_to)
+
+    irsdk.IRSDK.startup = startup
+    return irsdk
+
+def bench_overlay(script, test_file, seconds=5.0, verify=False, dump_to=None):
+    sys.modules['irsdk'] = load_sdk(test_file)
+    for name in ('win32gui', 'win32con', 'win32api'):
+        sys.modules[name] = Win32Stub(name)
+    import pygame
+    pygame.display.get_wm_info = lambda: {'window': 0}
+
+    stats = dict(frames=0, updates=0, pixels=0, mismatched=0)
+    flip, update = pygame.display.flip, pygame.display.update
+
+    def pushed(rects):
+        screen = pygame.display.get_surface()
+        stats['updates'] += 1
+        stats['pixels'] += sum(screen.get_rect().clip(rect).width * screen.get_rect().clip(rect).height for rect in rects)
+        if dump_to and stats['updates'] == 1:
+            with open(dump_to, 'wb') as f:
+                f.write(pygame.image.tobytes(screen, 'RGB'))
+
+    def counting_flip():
+        pushed([pygame.display.get_surface().get_rect()])
+        flip()
+
+    def counting_update(rects=None):
+        screen = pygame.display.get_surface()
+        pushed([screen.get_rect()] if rects is None else rects)
+        update(rects)
+        if verify:
+            # whatever was updated has to look like a full repaint of every widget
+            overlay = sys._getframe(1).f_globals
+            reference = pygame.Surface(screen.get_size())
+            reference.fill(overlay['background'])
+            if 'background_layer' in overlay:
+                reference.blit(overlay['background_layer'], (0, 0))
+            for widget in overlay['widgets']:
+                widget[-1](reference)
+            if pygame.image.tobytes(reference, 'RGB') != pygame.image.tobytes(screen, 'RGB'):
+                stats['mismatched'] += 1
+
+    pygame.display.flip, pygame.display.update = counting_flip, counting_update
+
+    clock_class = pygame.time.Clock
+
+    class CountingClock:
+        def __init__(self):
+            self.clock = clock_class()
+
+        def tick(self, framerate=0):
+            stats['frames'] += 1
+            if time.perf_counter() - start > seconds:
+                raise Done
+            return self.clock.tick(framerate)
+
+    pygame.time.Clock = CountingClock
+    start = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except Done:
+        pass
+    finally:
+        pygame.display.flip, pygame.display.update = flip, update
+        pygame.time.Clock = clock_class
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - start
+    stats['pixels_per_second'] = stats['pixels'] / wall
+    stats['cpu'] = cpu / wall
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('script', help='overlay script to run, e.g. RPMGaugeV7.py')
+    parser.add_argument('--test', default=os.environ.get('IRSDK_TEST_FILE'), help='irsdk mmap file the overlay reads, defaults to $IRSDK_TEST_FILE')
+    parser.add_argument('--seconds', type=float, default=5.0, help='how long to run the overlay')
+    parser.add_argument('--verify', action='store_true', help='compare every updated frame with a full repaint')
+    parser.add_argument('--dump', help='write first frame as raw RGB to this file')
+    args = parser.parse_args()
+    if not args.test:
+        parser.error('--test or $IRSDK_TEST_FILE is required')
+
+    stats = bench_overlay(args.script, args.test, args.seconds, args.verify, args.dump)
+    print('%s: frames %d, display updates %d, %.0f px/s, cpu %.1f%%' % (
+        os.path.basename(args.script), stats['frames'], stats['updates'], stats['pixels_per_second'], stats['cpu'] * 100))
+    if args.verify:
+        print('%d mismatched frames' % stats['mismatched'])
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,7 @@ import win32con
 import win32api
 import sys
 import os
-from collections import deque
+from collections import deque, OrderedDict
 #Settings Area------------------------------------------------------------------------------------------------------------
 background = (0, 0, 0, 255)
 RMPSizeModulator = 20
@@ -86,36 +86,130 @@ def move_window(x, y):
     hwnd = pygame.display.get_wm_info()['window']
     win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST, x, y, 0, 0, win32con.SWP_NOSIZE)
 
+# Font and text caches, fonts load once and recurring labels render once
+TEXT_CACHE_SIZE = 256
+fonts = {}
+text_cache = OrderedDict()
+text_cache_hits = 0
+text_cache_misses = 0
+text_cache_bytes = 0
+
+def get_font(size, face=None):
+    """ Load each (face, size) font once. """
+    key = (face, size)
+    if key not in fonts:
+        fonts[key] = pygame.font.Font(face, size)
+    return fonts[key]
+
+def render_text(text, size, color, antialias=True, face=None):
+    """ Render text through an LRU cache, the returned surface is shared so only blit it. """
+    global text_cache_hits, text_cache_misses, text_cache_bytes
+    key = (text, face, size, color, antialias)
+    text_surf = text_cache.get(key)
+    if text_surf is not None:
+        text_cache.move_to_end(key)
+        text_cache_hits += 1
+        return text_surf
+    text_cache_misses += 1
+    text_surf = get_font(size, face).render(text, antialias, color)
+    text_cache[key] = text_surf
+    text_cache_bytes += text_surf.get_pitch() * text_surf.get_height()
+    if len(text_cache) > TEXT_CACHE_SIZE:
+        _, oldest = text_cache.popitem(last=False)
+        text_cache_bytes -= oldest.get_pitch() * oldest.get_height()
+    return text_surf
+
+def text_cache_stats():
+    """ Hit rate and memory of the text cache, for tuning TEXT_CACHE_SIZE. """
+    lookups = text_cache_hits + text_cache_misses
+    return {
+        'entries': len(text_cache),
+        'fonts': len(fonts),
+        'hits': text_cache_hits,
+        'misses': text_cache_misses,
+        'hit_rate': text_cache_hits / lookups if lookups else 0.0,
+        'bytes': text_cache_bytes,
+    }
+
 def draw_button(surface, rect, text):
     """ Draw a button on the screen. """
-    pygame.draw.rect(surface, (0, 0, 255), rect)  # Blue background
+    drawn = pygame.draw.rect(surface, (0, 0, 255), rect)  # Blue background
     pygame.draw.rect(surface, (255, 255, 255), rect, 2)  # White border
-    font = pygame.font.Font(None, 20)  # Smaller font size for the button text
-    text_surf = font.render(text, True, (255, 255, 255))
+    text_surf = render_text(text, 20, (255, 255, 255))  # Smaller font size for the button text
     text_rect = text_surf.get_rect(center=rect.center)
-    surface.blit(text_surf, text_rect)
+    return drawn.union(surface.blit(text_surf, text_rect))
 
 def is_point_in_rect(point, rect):
     """ Check if a point is inside a rectangle. """
     x, y = point
     return rect.left <= x <= rect.right and rect.top <= y <= rect.bottom
 
-def draw_fuel_display(surface, center, radius, fuel_level, average_fuel_per_lap):
-    """ Draw the fuel display in the middle of the screen. """
+# Dirty rectangle rendering, widgets are only repainted when what they show changed
+widget_frames = {}  # name -> (state, rect) as drawn last frame
+
+def merge_rects(rects):
+    """ Union overlapping rects, so no area is repainted twice. """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i >= 0:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+def draw_widgets(surface, layer, widgets, full_redraw=False):
+    """ Draw widgets that changed since last frame and return the rects to pass to pygame.display.update.
+    layer is the static background the widgets are drawn on, see build_background_layer.
+    widgets is a list of (name, state, rect, draw) from back to front, state is anything that changes when the
+    widget would look different, rect is the area it covers worked out from the layout and draw(surface) draws it. """
+    if full_redraw:
+        widget_frames.clear()
+        surface.blit(layer, (0, 0))
+        for name, state, rect, draw in widgets:
+            widget_frames[name] = (state, rect)
+            draw(surface)
+        return [surface.get_rect()]
+
+    dirty_rects = []
+    for name, state, rect, draw in widgets:
+        if name in widget_frames:
+            if widget_frames[name][0] == state:
+                continue
+            dirty_rects.append(widget_frames[name][1])
+        widget_frames[name] = (state, rect)
+        dirty_rects.append(rect)
+    if not dirty_rects:
+        return []
+
+    # Widgets can hang off the window after a drag, only repaint what is on it
+    screen_rect = surface.get_rect()
+    dirty_rects = [rect for rect in (rect.clip(screen_rect) for rect in merge_rects(dirty_rects)) if rect]
+    for dirty_rect in dirty_rects:
+        surface.set_clip(dirty_rect)
+        surface.blit(layer, dirty_rect, dirty_rect)
+        for name, state, rect, draw in widgets:
+            if rect.colliderect(dirty_rect):
+                draw(surface)
+    surface.set_clip(None)
+    return dirty_rects
+
+def draw_fuel_display_frame(surface, center, radius):
+    """ Draw the circle behind the fuel display, part of the background layer. """
     # Draw a larger circle by increasing the radius by 20%
     larger_radius = int(radius * 1.4)
     
     pygame.draw.circle(surface, background, center, larger_radius)  # Black background circle
     pygame.draw.circle(surface, (255, 255, 255), center, larger_radius, 1)  # White border
 
-    font = pygame.font.Font(None, 24)
-    fuel_text = font.render(f"FL: {fuel_level:.1f}%", True, (255, 0, 174))
+def layout_fuel_display(center, fuel_level, average_fuel_per_lap):
+    """ Texts of the fuel display with the rects they go in. """
+    fuel_text = render_text(f"FL: {fuel_level:.1f}%", 24, (255, 0, 174))
     text_rect = fuel_text.get_rect(center=(center[0], center[1] - 25))
-    surface.blit(fuel_text, text_rect)
 
-    average_fuel_text = font.render(f"5AV: {average_fuel_per_lap:.2f}", True, (255, 0, 174))
+    average_fuel_text = render_text(f"5AV: {average_fuel_per_lap:.2f}", 24, (255, 0, 174))
     average_text_rect = average_fuel_text.get_rect(center=(center[0], center[1] + 5))
-    surface.blit(average_fuel_text, average_text_rect)
 
     # Calculate laps remaining (FLR)
     if average_fuel_per_lap > 0:
@@ -123,76 +217,183 @@ def draw_fuel_display(surface, center, radius, fuel_level, average_fuel_per_lap)
     else:
         laps_remaining = 0
 
-    laps_remaining_text = font.render(f"FLR: {laps_remaining:.2f}", True, (255, 0, 174))
+    laps_remaining_text = render_text(f"FLR: {laps_remaining:.2f}", 24, (255, 0, 174))
     laps_remaining_text_rect = laps_remaining_text.get_rect(center=(center[0], center[1] + 30))
-    surface.blit(laps_remaining_text, laps_remaining_text_rect)
+    return [(fuel_text, text_rect), (average_fuel_text, average_text_rect), (laps_remaining_text, laps_remaining_text_rect)]
+
+def fuel_display_rect(center, fuel_level, average_fuel_per_lap):
+    """ Area draw_fuel_display covers. """
+    texts = layout_fuel_display(center, fuel_level, average_fuel_per_lap)
+    return texts[0][1].unionall([text_rect for _, text_rect in texts[1:]])
+
+def draw_fuel_display(surface, center, radius, fuel_level, average_fuel_per_lap):
+    """ Draw the fuel display in the middle of the screen. """
+    for text, text_rect in layout_fuel_display(center, fuel_level, average_fuel_per_lap):
+        surface.blit(text, text_rect)
+
+gradient_surface_cache = {}
+
+def get_gradient_surface(radius):
+    """ Blue disc rendered once per radius, black is transparent. """
+    if radius not in gradient_surface_cache:
+        gradient_surface_cache.clear()  # only changes on resize
+        gradient = pygame.Surface((radius * 2, radius * 2))
+        gradient.set_colorkey((0, 0, 0))
+        # Same circles as before, drawn once, alpha is dropped here like it is on the display
+        for r in range(radius, 0, -1):
+            alpha = int(255 * (r / radius))
+            color = (0, 0, 255, alpha)
+            pygame.draw.circle(gradient, color, (radius, radius), r)
+        gradient_surface_cache[radius] = gradient
+    return gradient_surface_cache[radius]
 
 def draw_gradient_circle(surface, center, radius):
     """ Draw a gradient circle from outside to inside with a blue color scheme. """
-    for r in range(radius, 0, -1):
-        alpha = int(255 * (r / radius))
-        color = (0, 0, 255, alpha)
-        pygame.draw.circle(surface, color, center, r)
-
-def draw_rpm_gauge(surface, center, radius, rpm, max_rpm, gear, shift_rpm):
-    """ Draw the RPM gauge with blobs and gear number, flashing pink at shift RPM. """
+    if radius <= 0:
+        return pygame.Rect(center, (0, 0))
+    return surface.blit(get_gradient_surface(radius), (center[0] - radius, center[1] - radius))
+
+# Caches for the RPM ring, everything in them only changes on resize, drag or RPM bucket change
+ring_positions_cache = {}
+blob_sprite_cache = {}
+ring_surface_cache = {}
+RING_CACHE_SIZE = 128
+
+def get_ring_positions(center, radius, num_blobs):
+    """ Blob positions around the ring, computed once per center and radius. """
+    key = (center[0], center[1], radius, num_blobs)
+    if key not in ring_positions_cache:
+        if len(ring_positions_cache) >= RING_CACHE_SIZE:
+            ring_positions_cache.clear()  # old centers after a drag
+        angle_step = 360 / num_blobs
+        positions = []
+        for i in range(num_blobs):
+            angle = math.radians(i * angle_step)
+            blob_x = center[0] + (radius - 15) * math.cos(angle)
+            blob_y = center[1] - (radius - 15) * math.sin(angle)
+            positions.append((int(blob_x), int(blob_y)))
+        ring_positions_cache[key] = positions
+    return ring_positions_cache[key]
+
+def get_blob_sprite(color, blob_radius):
+    """ One blob drawn once, black is transparent. """
+    key = (color, blob_radius)
+    if key not in blob_sprite_cache:
+        sprite = pygame.Surface((blob_radius * 2 + 1, blob_radius * 2 + 1))
+        sprite.set_colorkey((0, 0, 0))
+        pygame.draw.circle(sprite, color, (blob_radius, blob_radius), blob_radius)
+        blob_sprite_cache[key] = sprite
+    return blob_sprite_cache[key]
+
+def get_ring_surface(center, radius, num_blobs, color, blob_radius):
+    """ The whole blob ring for one size and color bucket, black is transparent. """
+    key = (center[0], center[1], radius, num_blobs, color, blob_radius)
+    if key not in ring_surface_cache:
+        if len(ring_surface_cache) >= RING_CACHE_SIZE:
+            ring_surface_cache.clear()  # old center or radius after a drag or resize
+        half = radius - 15 + blob_radius + 1
+        left, top = center[0] - half, center[1] - half
+        ring = pygame.Surface((half * 2 + 1, half * 2 + 1))
+        ring.set_colorkey((0, 0, 0))
+        sprite = get_blob_sprite(color, blob_radius)
+        for blob_x, blob_y in get_ring_positions(center, radius, num_blobs):
+            ring.blit(sprite, (blob_x - blob_radius - left, blob_y - blob_radius - top))
+        ring_surface_cache[key] = ring
+    return ring_surface_cache[key]
+
+def draw_rpm_gauge_frame(surface, center, radius):
+    """ Draw the outer ring and inner disc of the RPM gauge, part of the background layer. """
     pygame.draw.circle(surface, (255, 255, 255), center, radius, 2)
     pygame.draw.circle(surface, (0, 0, 0), center, radius - 10)
 
+def get_blob_radius(rpm, max_rpm):
+    """ Blobs grow with RPM. """
+    return int(5 + (rpm / max_rpm) * RMPSizeModulator)
+
+def layout_rpm_gauge_text(center, radius, rpm, gear):
+    """ RPM and gear texts of the gauge with the rects they go in. """
+    rpm_text = render_text(f"{rpm:.0f} RPM" if rpm is not None else "RPM: N/A", 28, (255, 255, 255))
+    text_rect = rpm_text.get_rect(center=(center[0], center[1] + radius + 30))
+
+    gear_font_size = int(radius * gear_font_ratio)
+    gear_text = render_text(f"{gear}" if gear is not None else "Gear: N/A", gear_font_size, (255, 255, 255))
+    gear_text_rect = gear_text.get_rect(center=center)
+    return [(rpm_text, text_rect), (gear_text, gear_text_rect)]
+
+def rpm_gauge_rect(center, radius, rpm, max_rpm, gear):
+    """ Area draw_rpm_gauge covers: the blob ring, the gradient inside it and the texts. """
+    half = radius - 15 + get_blob_radius(rpm, max_rpm) + 1
+    rect = pygame.Rect(center[0] - half, center[1] - half, half * 2 + 1, half * 2 + 1)
+    gradient_radius = int(radius * 0.6)
+    if gradient_radius > 0:
+        rect.union_ip((center[0] - gradient_radius, center[1] - gradient_radius, gradient_radius * 2, gradient_radius * 2))
+    return rect.unionall([text_rect for _, text_rect in layout_rpm_gauge_text(center, radius, rpm, gear)])
+
+def draw_rpm_gauge(surface, center, radius, rpm, max_rpm, gear, shift_rpm):
+    """ Draw the RPM gauge with blobs and gear number, flashing pink at shift RPM. """
     num_blobs = 500
-    angle_step = 360 / num_blobs
     
     flash_color = (255, 105, 180)  # Pink color for flashing effect
     flash_state = (rpm >= shift_rpm)  # True if RPM is greater than or equal to shift RPM
 
-    for i in range(num_blobs):
-        angle = math.radians(i * angle_step)
-        blob_radius = 5 + (rpm / max_rpm) * RMPSizeModulator
-        blob_x = center[0] + (radius - 15) * math.cos(angle)
-        blob_y = center[1] - (radius - 15) * math.sin(angle)
-        
-        if rpm is not None:
-            if rpm < (max_rpm * 0.33):
-                blob_color = (255, 0, 0)
-            elif rpm < (max_rpm * 0.70):
-                blob_color = (255, 255, 0)
-            elif rpm < (max_rpm * 0.95):
-                blob_color = (0, 255, 0)
-            else:
-                blob_color = (0, 255, 255)
+    blob_radius = get_blob_radius(rpm, max_rpm)
+    if rpm is not None:
+        if rpm < (max_rpm * 0.33):
+            blob_color = (255, 0, 0)
+        elif rpm < (max_rpm * 0.70):
+            blob_color = (255, 255, 0)
+        elif rpm < (max_rpm * 0.95):
+            blob_color = (0, 255, 0)
         else:
-            blob_color = (255, 255, 255)
-        
-        if flash_state:
-            blob_color = flash_color
+            blob_color = (0, 255, 255)
+    else:
+        blob_color = (255, 255, 255)
+    
+    if flash_state:
+        blob_color = flash_color
 
-        pygame.draw.circle(surface, blob_color, (int(blob_x), int(blob_y)), int(blob_radius))
+    # Same size and color bucket as a previous frame reuses the ring as it is
+    ring = get_ring_surface(center, radius, num_blobs, blob_color, blob_radius)
+    half = ring.get_width() // 2
+    surface.blit(ring, (center[0] - half, center[1] - half))
 
     draw_gradient_circle(surface, center, int(radius * 0.6))
 
-    font = pygame.font.Font(None, 28)
-    rpm_text = font.render(f"{rpm:.0f} RPM" if rpm is not None else "RPM: N/A", True, (255, 255, 255))
-    text_rect = rpm_text.get_rect(center=(center[0], center[1] + radius + 30))
-    surface.blit(rpm_text, text_rect)
+    for text, text_rect in layout_rpm_gauge_text(center, radius, rpm, gear):
+        surface.blit(text, text_rect)
 
-    gear_font_size = int(radius * gear_font_ratio)
-    gear_font = pygame.font.Font(None, gear_font_size)
-    gear_text = gear_font.render(f"{gear}" if gear is not None else "Gear: N/A", True, (255, 255, 255))
-    gear_text_rect = gear_text.get_rect(center=center)
-    surface.blit(gear_text, gear_text_rect)
+def draw_bar_frame(surface, x, y, width, height):
+    """ Draw the empty bar with its border, part of the background layer. """
+    pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
+    pygame.draw.rect(surface, (255, 255, 255), (x, y, width, height), 2)
+
+def layout_bar_text(x, y, width, height, percentage):
+    """ Percentage text of a bar with the rect it goes in. """
+    percentage_text = render_text(f"{percentage:.0f}%" if percentage is not None else "0%", 24, (255, 255, 255))
+    return percentage_text, percentage_text.get_rect(center=(x + width / 2, y + height / 2))
+
+def bar_rect(x, y, width, height, percentage):
+    """ Area draw_bar covers, the fill never leaves the bar. """
+    return pygame.Rect(x, y, width, height).union(layout_bar_text(x, y, width, height, percentage)[1])
 
 def draw_bar(surface, x, y, width, height, percentage, color):
     """ Draw a bar with a specified percentage and color. """
-    pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
-    pygame.draw.rect(surface, (255, 255, 255), (x, y, width, height), 2)
-    
     fill_height = (percentage / 100) * height
     pygame.draw.rect(surface, color, (x, y + height - fill_height, width, fill_height))
 
-    font = pygame.font.Font(None, 24)
-    percentage_text = font.render(f"{percentage:.0f}%" if percentage is not None else "0%", True, (255, 255, 255))
-    text_rect = percentage_text.get_rect(center=(x + width / 2, y + height / 2))
-    surface.blit(percentage_text, text_rect)
+    surface.blit(*layout_bar_text(x, y, width, height, percentage))
+
+def build_background_layer(size, bars, gauge_center, gauge_radius, fuel_center, fuel_radius, button_rect):
+    """ Render everything that does not change between frames once, it is blitted under the widgets
+    and only rebuilt when the layout changes. bars is a list of (x, y, width, height). """
+    layer = pygame.Surface(size)
+    layer.fill(background)
+    for x, y, width, height in bars:
+        draw_bar_frame(layer, x, y, width, height)
+    draw_rpm_gauge_frame(layer, gauge_center, gauge_radius)
+    draw_fuel_display_frame(layer, fuel_center, fuel_radius)
+    draw_button(layer, button_rect, "TB")
+    return layer
 
 # Set up the display with NOFRAME flag for a borderless window initially
 screen_width, screen_height = 500, 250
@@ -230,11 +431,20 @@ previous_fuel_level = 0.0
 fuel_levels = deque(maxlen=5)
 max_speed_mph = 0  # Initialize max speed
 
+# Repaint everything on the first frame, after a resize and after the window was recreated
+full_redraw = True
+last_screen_size = None
+background_layer = None
+background_layout = None
+
 # Main loop
 running = True
 while running:
     # Update item dimensions and positions based on window size
     screen_width, screen_height = pygame.display.get_surface().get_size()
+    if (screen_width, screen_height) != last_screen_size:
+        last_screen_size = (screen_width, screen_height)
+        full_redraw = True
     
     # Adjust the vertical position to move the bars down
     vertical_offset = int(screen_height * 0.1)
@@ -283,6 +493,7 @@ while running:
                 elif is_point_in_rect(event.pos, button_rect):
                     borderless = not borderless
                     set_window_mode(borderless)
+                    full_redraw = True
                 if dragging_item:
                     drag_start_x, drag_start_y = event.pos
         elif event.type == pygame.MOUSEBUTTONUP:
@@ -312,9 +523,8 @@ while running:
                     fuel_rect.topleft = (fuel_center[0] - fuel_radius, fuel_center[1] - fuel_radius)
                 
                 drag_start_x, drag_start_y = event.pos
-
-    # Clear the screen with a transparent color
-    screen.fill(background)  # No alpha needed here, just solid color for background 0,0,0 if you want clear.
+        elif event.type == pygame.WINDOWEXPOSED:
+            full_redraw = True
 
     # Fetch the latest data
     try:
@@ -387,49 +597,64 @@ while running:
         average_fuel_per_lap = 0.0
 
     # Render the data
-    font = pygame.font.Font(None, 36)
-    lap_time_text = font.render(f"Last Lap: {format_time(lap_time)}", True, (174, 255, 0))  # Purple for lap time
-    screen.blit(lap_time_text, (20, 20))
-
-    # Draw the RPM gauge with blobs
-    draw_rpm_gauge(screen, gauge_center, gauge_radius, rpm, 10000, gear, shift_rpm)
-
-    # Draw the throttle and brake bars
-    draw_bar(screen, throttle_bar_x, throttle_bar_y, throttle_bar_width, throttle_bar_height, throttle_percentage, (0, 255, 0))
-    draw_bar(screen, brake_bar_x, brake_bar_y, brake_bar_width, brake_bar_height, brake_percentage, (255, 0, 0))
-
-    # Draw the fuel display
-    draw_fuel_display(screen, fuel_center, fuel_radius, fuel_level, average_fuel_per_lap)
+    lap_time_text = render_text(f"Last Lap: {format_time(lap_time)}", 36, (174, 255, 0))  # Purple for lap time
 
     # Draw the speed text below the fuel gauge
-    font_speed = pygame.font.Font(None, 30)  # Slightly larger font size for better visibility
-    font_weather = pygame.font.Font(None, 25)
-    speed_text = font_speed.render(f" {speed_mph:.2f} mph", True, speed_color)
+    # Slightly larger font size (30) for better visibility
+    speed_text = render_text(f" {speed_mph:.2f} mph", 30, speed_color)
     speed_text_rect = speed_text.get_rect(center=(fuel_center[0], fuel_center[1] + fuel_radius + 60))  # Increase vertical offset for better placement
-    screen.blit(speed_text, speed_text_rect)
 
     # Draw the new data values
-    font_small = pygame.font.Font(None, 23)
-    track_temp_text = font_weather.render(f"TT: {track_temp:.1f}°C", True, (25, 0, 255))
-    precipitation_text = font_weather.render(f"P: {precipitation*100:.2f}%", True, (25, 0, 255))
-    track_wetness_text = font_weather.render(f"TW: {track_wetness:.1f}", True, (25, 0, 255))
+    track_temp_text = render_text(f"TT: {track_temp:.1f}°C", 25, (25, 0, 255))
+    precipitation_text = render_text(f"P: {precipitation*100:.2f}%", 25, (25, 0, 255))
+    track_wetness_text = render_text(f"TW: {track_wetness:.1f}", 25, (25, 0, 255))
 
 # Change ABS text color based on its state
     abs_color = (187, 255, 0) if BrakeABSactive == 1 else (25, 0, 255)
-    BrakeABSactive_text = font_speed.render(f"ABS: {BrakeABSactive:.1f}", True, abs_color)
-
-# Position the new data values at the top right
-    screen.blit(track_temp_text, (screen_width - 260, 10))
-    screen.blit(precipitation_text, (screen_width - 260, 40))
-    screen.blit(track_wetness_text, (screen_width - 260, 70))
-    screen.blit(BrakeABSactive_text, (screen_width - 400, 190))
-
-
-    # Draw the button
-    draw_button(screen, button_rect, "TB")
-
-    # Update the display
-    pygame.display.flip()
+    BrakeABSactive_text = render_text(f"ABS: {BrakeABSactive:.1f}", 30, abs_color)
+
+    # Rebuild the static background on resize, drag or window mode toggle
+    layout = (screen_width, screen_height, borderless, background,
+              (throttle_bar_x, throttle_bar_y, throttle_bar_width, throttle_bar_height),
+              (brake_bar_x, brake_bar_y, brake_bar_width, brake_bar_height),
+              tuple(gauge_center), gauge_radius, tuple(fuel_center), fuel_radius, tuple(button_rect))
+    if layout != background_layout:
+        background_layout = layout
+        background_layer = build_background_layer((screen_width, screen_height), layout[4:6],
+                                                  gauge_center, gauge_radius, fuel_center, fuel_radius, button_rect)
+        full_redraw = True
+
+    # Each widget with what it shows, back to front, the new data values are positioned at the top right
+    widgets = [
+        ('lap_time', lap_time, lap_time_text.get_rect(topleft=(20, 20)), lambda s: s.blit(lap_time_text, (20, 20))),
+        ('gauge', (tuple(gauge_center), gauge_radius, rpm, gear, shift_rpm),
+         rpm_gauge_rect(gauge_center, gauge_radius, rpm, 10000, gear),
+         lambda s: draw_rpm_gauge(s, gauge_center, gauge_radius, rpm, 10000, gear, shift_rpm)),
+        ('throttle', (throttle_bar_x, throttle_bar_y, throttle_bar_width, throttle_bar_height, throttle_percentage),
+         bar_rect(throttle_bar_x, throttle_bar_y, throttle_bar_width, throttle_bar_height, throttle_percentage),
+         lambda s: draw_bar(s, throttle_bar_x, throttle_bar_y, throttle_bar_width, throttle_bar_height, throttle_percentage, (0, 255, 0))),
+        ('brake', (brake_bar_x, brake_bar_y, brake_bar_width, brake_bar_height, brake_percentage),
+         bar_rect(brake_bar_x, brake_bar_y, brake_bar_width, brake_bar_height, brake_percentage),
+         lambda s: draw_bar(s, brake_bar_x, brake_bar_y, brake_bar_width, brake_bar_height, brake_percentage, (255, 0, 0))),
+        ('fuel', (tuple(fuel_center), fuel_radius, fuel_level, average_fuel_per_lap),
+         fuel_display_rect(fuel_center, fuel_level, average_fuel_per_lap),
+         lambda s: draw_fuel_display(s, fuel_center, fuel_radius, fuel_level, average_fuel_per_lap)),
+        ('speed', (speed_mph, speed_color, tuple(speed_text_rect)), speed_text_rect, lambda s: s.blit(speed_text, speed_text_rect)),
+        ('track_temp', (track_temp, screen_width), track_temp_text.get_rect(topleft=(screen_width - 260, 10)),
+         lambda s: s.blit(track_temp_text, (screen_width - 260, 10))),
+        ('precipitation', (precipitation, screen_width), precipitation_text.get_rect(topleft=(screen_width - 260, 40)),
+         lambda s: s.blit(precipitation_text, (screen_width - 260, 40))),
+        ('track_wetness', (track_wetness, screen_width), track_wetness_text.get_rect(topleft=(screen_width - 260, 70)),
+         lambda s: s.blit(track_wetness_text, (screen_width - 260, 70))),
+        ('abs', (BrakeABSactive, screen_width), BrakeABSactive_text.get_rect(topleft=(screen_width - 400, 190)),
+         lambda s: s.blit(BrakeABSactive_text, (screen_width - 400, 190))),
+    ]
+
+    # Update only the parts of the display that changed, nothing at all when nothing did
+    dirty_rects = draw_widgets(screen, background_layer, widgets, full_redraw)
+    full_redraw = False
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
 
     # Cap the frame rate to 20 FPS
     clock.tick(20)
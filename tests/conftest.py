@@ -0,0 +1,47 @@
+import ast
+import importlib.util
+import math
+import os
+from collections import OrderedDict
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OLDER_VERSIONS_DIR = os.path.join(REPO_DIR, 'Older Versions')
+
+
+def load_script(file_name, module_name):
+    # scripts here have names python can't import, load them from their path
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(OLDER_VERSIONS_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_overlay_defs(file_name):
+    # overlays open their window and run their main loop at import, take only their functions and constants
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+    file_name = os.path.join(REPO_DIR, file_name)
+    with open(file_name, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), file_name)
+    body = [
+        node for node in tree.body
+        if isinstance(node, ast.FunctionDef) or isinstance(node, ast.Assign) and (
+            isinstance(node.value, (ast.Constant, ast.Tuple, ast.List, ast.Dict))
+            or isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'OrderedDict')
+    ]
+    namespace = dict(__file__=file_name, pygame=pygame, math=math, OrderedDict=OrderedDict)
+    exec(compile(ast.Module(body, []), file_name, 'exec'), namespace)
+    return namespace
+
+
+@pytest.fixture(scope='session')
+def irsdk():
+    return load_script('#!python3.py', 'irsdk_vendored')
+
+
+@pytest.fixture(scope='session')
+def irsdk_synth():
+    return load_script('irsdk_synth.py', 'irsdk_synth')
@@ -0,0 +1,145 @@
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import pytest
+from multiprocessing import resource_tracker
+
+from test_var_buffer import swap_var_offsets
+
+
+@pytest.fixture
+def synth_ir(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    synth.step()
+    ir = irsdk.IRSDK()
+    assert ir.startup(test_file=mem_file)
+    yield synth, ir
+    ir.shutdown()
+    synth.close()
+
+
+@pytest.fixture
+def shm_name():
+    return 'IRSDKHubTest%s' % uuid.uuid4().hex[:8]
+
+
+def attach_client(irsdk, shm_name):
+    client = irsdk.IRSDKHubClient(shm_name)
+    if os.name == 'posix':
+        # readers run in their own process, here the hub in this one still has to unlink the memory
+        resource_tracker.register('/' + shm_name, 'shared_memory')
+    return client
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def crash(irsdk, hub, pid, heartbeat):
+    # leave the hub memory as a killed hub process would
+    sequence, slots, slot_size, _, _ = irsdk.HUB_HEADER.unpack_from(hub._shm.buf, 0)
+    irsdk.HUB_HEADER.pack_into(hub._shm.buf, 0, sequence, slots, slot_size, pid, heartbeat)
+
+
+def test_live_hub_is_not_reclaimed(irsdk, synth_ir, shm_name):
+    synth, ir = synth_ir
+    hub = irsdk.IRSDKHub(ir, ['RPM'], shm_name=shm_name)
+    stop = threading.Event()
+
+    def publish():
+        while not stop.is_set():
+            hub.publish()
+            time.sleep(0.01)
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    try:
+        with pytest.raises(FileExistsError):
+            irsdk.IRSDKHub(ir, ['RPM'], shm_name=shm_name)
+    finally:
+        stop.set()
+        thread.join()
+    client = attach_client(irsdk, shm_name)
+    synth.step()
+    assert hub.publish()
+    assert client.frame.data.RPM == ir['RPM']
+    client.close()
+    hub.close()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='pid check is posix only')
+def test_killed_hub_is_reclaimed_in_place(irsdk, synth_ir, shm_name):
+    synth, ir = synth_ir
+    old_hub = irsdk.IRSDKHub(ir, ['RPM', 'Speed'], shm_name=shm_name)
+    synth.step()
+    old_hub.publish()
+    client = attach_client(irsdk, shm_name)
+    crash(irsdk, old_hub, dead_pid(), time.time())
+
+    hub = irsdk.IRSDKHub(ir, ['RPM', 'Speed'], shm_name=shm_name)
+    assert hub.sequence == old_hub.sequence
+    synth.step()
+    assert hub.publish()
+    # reader attached to the dead hub carries on with the new one
+    assert client.frame.tick_count == ir.frozen_tick_count
+    assert client.frame.data.Speed == ir['Speed']
+    client.close()
+    hub.close()
+
+
+def test_stale_hub_with_other_layout_is_replaced(irsdk, synth_ir, shm_name):
+    synth, ir = synth_ir
+    old_hub = irsdk.IRSDKHub(ir, ['RPM'], shm_name=shm_name)
+    crash(irsdk, old_hub, os.getpid(), time.time() - irsdk.HUB_HEARTBEAT_TIMEOUT - 1)
+
+    hub = irsdk.IRSDKHub(ir, ['RPM', 'Gear'], shm_name=shm_name)
+    synth.step()
+    assert hub.publish()
+    client = attach_client(irsdk, shm_name)
+    assert set(client.names) == {'RPM', 'Gear'}
+    assert client.frame.data.Gear == ir['Gear']
+    client.close()
+    hub.close()
+
+
+def test_taken_over_hub_leaves_new_memory_alone(irsdk, synth_ir, shm_name):
+    synth, ir = synth_ir
+    old_hub = irsdk.IRSDKHub(ir, ['RPM'], shm_name=shm_name)
+    crash(irsdk, old_hub, os.getpid(), time.time() - irsdk.HUB_HEARTBEAT_TIMEOUT - 1)
+    hub = irsdk.IRSDKHub(ir, ['RPM'], shm_name=shm_name)
+
+    # old hub was only stuck, it must neither write into nor remove the new hub's memory
+    old_hub._pid = dead_pid()
+    synth.step()
+    with pytest.raises(RuntimeError):
+        old_hub.publish()
+    old_hub.close()
+    client = attach_client(irsdk, shm_name)
+    assert hub.publish()
+    assert client.frame.data.RPM == ir['RPM']
+    client.close()
+    hub.close()
+
+
+def test_hub_follows_rewritten_var_headers(irsdk, synth_ir, shm_name):
+    synth, ir = synth_ir
+    hub = irsdk.IRSDKHub(ir, ['RPM', 'Speed'], shm_name=shm_name)
+    client = attach_client(irsdk, shm_name)
+    synth.step()
+    assert hub.publish()
+    rpm, speed = client.frame.data.RPM, client.frame.data.Speed
+
+    swap_var_offsets(irsdk, synth._mem, 'RPM', 'Speed')
+    synth.update_session_info()
+    assert hub.publish()
+    assert (client.frame.data.RPM, client.frame.data.Speed) == (speed, rpm)
+    client.close()
+    hub.close()
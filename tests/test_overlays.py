@@ -0,0 +1,59 @@
+import pygame
+import pytest
+
+from conftest import load_overlay_defs
+
+GRADIENT_RADII = (27, 45, 60, 90)
+
+
+def draw_gradient_circle_reference(surface, center, radius):
+    # what the overlay drew every frame before the disc was cached, alpha is dropped on the display surface
+    for r in range(radius, 0, -1):
+        alpha = int(255 * (r / radius))
+        color = (0, 0, 255, alpha)
+        pygame.draw.circle(surface, color, center, r)
+
+
+def screen_with_content(size):
+    # non black content under the disc, so a transparent or see-through disc shows
+    screen = pygame.display.set_mode(size)
+    screen.fill((0, 0, 0))
+    for x in range(0, size[0], 7):
+        pygame.draw.line(screen, (200, 120, 40), (x, 0), (size[0] - x, size[1]))
+    return screen
+
+
+@pytest.fixture(scope='module')
+def rpm_gauge():
+    return load_overlay_defs('RPMGaugeV7.py')
+
+
+@pytest.mark.parametrize('radius', GRADIENT_RADII)
+def test_gradient_circle_matches_uncached(rpm_gauge, radius):
+    size = (radius * 2 + 40, radius * 2 + 40)
+    center = (radius + 17, radius + 23)
+
+    screen = screen_with_content(size)
+    draw_gradient_circle_reference(screen, center, radius)
+    expected = pygame.image.tobytes(screen, 'RGB')
+
+    screen = screen_with_content(size)
+    drawn = rpm_gauge['draw_gradient_circle'](screen, center, radius)
+    assert pygame.image.tobytes(screen, 'RGB') == expected
+    # reported rect has to cover everything the reference touched
+    touched = pygame.Surface(size)
+    touched.set_colorkey((0, 0, 0))
+    draw_gradient_circle_reference(touched, center, radius)
+    assert pygame.Rect(drawn).contains(touched.get_bounding_rect())
+
+
+@pytest.mark.parametrize('radius', GRADIENT_RADII)
+@pytest.mark.parametrize('rpm', (0, 2500, 6900, 9600, 10000))
+def test_rpm_gauge_rect_covers_drawing(rpm_gauge, radius, rpm):
+    # dirty rects come from rpm_gauge_rect without drawing, anything outside it would be left stale
+    size = (radius * 4 + 100, radius * 4 + 100)
+    center = (size[0] // 2, size[1] // 2)
+    touched = pygame.Surface(size)
+    touched.set_colorkey((0, 0, 0))
+    rpm_gauge['draw_rpm_gauge'](touched, center, radius, rpm, 10000, 4, 9500)
+    assert rpm_gauge['rpm_gauge_rect'](center, radius, rpm, 10000, 4).contains(touched.get_bounding_rect())
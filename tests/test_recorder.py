@@ -0,0 +1,38 @@
+from test_var_buffer import swap_var_offsets
+
+
+def test_recorder_rolls_over_on_rewritten_var_headers(irsdk, irsdk_synth, tmp_path, capsys):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    synth.step()
+    ir = irsdk.IRSDK()
+    assert ir.startup(test_file=mem_file)
+    recorder = irsdk.IRSDKRecorder(ir, str(tmp_path / 'rec.ibt'))
+    try:
+        rpm = []
+        for _ in range(5):
+            synth.step()
+            assert recorder.record()
+            rpm.append(ir['RPM'])
+
+        # same buf_len, only the offsets moved, the first file's var headers no longer fit
+        swap_var_offsets(irsdk, synth._mem, 'RPM', 'Speed')
+        synth.update_session_info()
+        for _ in range(3):
+            synth.step()
+            assert recorder.record()
+            rpm.append(ir['RPM'])
+    finally:
+        recorder.close()
+        ir.shutdown()
+        synth.close()
+
+    assert recorder.file_names == [str(tmp_path / 'rec.ibt'), str(tmp_path / 'rec_2.ibt')]
+    assert 'rec_2.ibt' in capsys.readouterr().out
+    recorded = []
+    for file_name in recorder.file_names:
+        ibt = irsdk.IBT()
+        ibt.open(file_name)
+        recorded += ibt.get_all('RPM')
+        ibt.close()
+    assert recorded == rpm
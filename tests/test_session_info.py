@@ -0,0 +1,259 @@
+import pytest
+
+# shaped like sim's session info, with the values that needed quoting fixes for PyYAML
+SESSION_INFO = r'''---
+WeekendInfo:
+ TrackName: spa 2022 gp
+ TrackID: 524
+ TrackLength: 6.93 km
+ TrackDisplayName: Circuit de Spa-Francorchamps
+ TrackCity: Stavelot
+ TrackAltitude: 395.06 m
+ TrackNumTurns: 20
+ TrackPitSpeedLimit: 60.00 kph
+ TrackSurfaceTemp: 35.49 C
+ TrackWindVel: 1.32 m/s
+ TrackRelativeHumidity: 55 %
+ SeriesID: 0
+ Official: 0
+ TeamRacing: off
+ DCRuleSet: None
+ BuildVersion: 2024.04.05.01
+ SimMode: full
+ HeatRacing: yes
+ NumCarClasses: 1
+ WeekendOptions:
+  NumStarters: 0
+  StartingGrid: single file
+  QualifyScoring: best lap
+  Unofficial: 0
+  Date: 2024-05-14
+  TimeOfDay: 1:00 pm
+  EarthRotationSpeedupFactor: 1
+  CommercialMode: consumer
+  NightMode: variable
+  IsFixedSetup: 0
+  HasOpenRegistration: no
+ TelemetryOptions:
+  TelemetryDiskFile: ""
+
+SessionInfo:
+ Sessions:
+ - SessionNum: 0
+   SessionLaps: unlimited
+   SessionTime: 3600.0000 sec
+   SessionNumLapsToAvg: 0
+   SessionType: Race
+   SessionName: RACE
+   SessionSubType:
+   ResultsPositions:
+   - Position: 1
+     ClassPosition: 0
+     CarIdx: 3
+     Lap: 12
+     Time: 1130.5071
+     FastestLap: 7
+     FastestTime: 95.1234
+     LastTime: -1.0000
+     LapsLed: 12
+     LapsComplete: 12
+     JokerLapsComplete: 0
+     LapsDriven: 12.000
+     Incidents: 4
+     ReasonOutId: 0
+     ReasonOutStr: Running
+   - Position: 2
+     ClassPosition: 1
+     CarIdx: 0
+     Lap: 12
+     Time: 1131.9001
+     FastestLap: 3
+     FastestTime: 95.5000
+     LastTime: 96.0101
+     LapsLed: 0
+     LapsComplete: 12
+     JokerLapsComplete: 0
+     LapsDriven: 12.000
+     Incidents: 0
+     ReasonOutId: 0
+     ReasonOutStr: Running
+   ResultsFastestLap:
+   - CarIdx: 3
+     FastestLap: 7
+     FastestTime: 95.1234
+   ResultsAverageLapTime: -1.0000
+   ResultsNumCautionFlags: 0
+   ResultsNumCautionLaps: 0
+   ResultsNumLeadChanges: 0
+   ResultsLapsComplete: -1
+   ResultsOfficial: 0
+ - SessionNum: 1
+   SessionLaps: 20
+   SessionTime: unlimited
+   SessionType: Race
+   SessionName: FEATURE
+   ResultsPositions:
+   ResultsFastestLap:
+   - CarIdx: 255
+     FastestLap: 0
+     FastestTime: -1.0000
+
+DriverInfo:
+ DriverCarIdx: 0
+ DriverUserID: 100000
+ PaceCarIdx: -1
+ DriverHeadPosX: -0.200
+ DriverCarIdleRPM: 900.000
+ DriverCarRedLine: 7500.000
+ DriverCarSLShiftRPM: 7000.000
+ DriverCarVersion: 2024.04.05.01
+ DriverSetupName: baseline, "wet" \ v2.sto
+ DriverSetupIsModified: 0
+ DriverSetupLoadTypeName: baseline
+ DriverSetupPassedTech: 1
+ DriverIncidentCount: 0
+ Drivers:
+ - CarIdx: 0
+   UserName: Driver O'Name
+   AbbrevName: Name, D
+   Initials: DN
+   UserID: 100000
+   TeamID: 0
+   TeamName: Driver "Team" 0
+   CarNumber: "0"
+   CarNumberRaw: 0
+   CarPath: mx5 mx52016
+   CarClassID: 74
+   CarIsPaceCar: 0
+   CarScreenName: Global Mazda MX-5 Cup
+   CarClassShortName:
+   CarClassRelSpeed: 0
+   CarClassMaxFuelPct: 1.000 %
+   CarClassColor: 0xffffff
+   CarClassEstLapTime: 95.1234
+   IRating: 1350
+   LicLevel: 12
+   LicString: C 3.49
+   LicColor: 0xfeec04
+   CarDesignStr: 0,ff0000,00ff00,0000ff
+   CarSponsorStr: ,12,44
+   ClubName: New England
+   DivisionName: Division 3
+   CurDriverIncidentCount: 4
+ - CarIdx: 1
+   UserName: C:\Users\Driver\ "Quick" Nick
+   AbbrevName:
+   Initials:
+   UserID: 100001
+   TeamID: 0
+   TeamName: Backslash \ Racing
+   CarNumber: "007"
+   CarNumberRaw: 7
+   CarPath: mx5 mx52016
+   CarClassID: 74
+   CarIsPaceCar: 0
+   CarScreenName: Global Mazda MX-5 Cup
+   CarClassShortName:
+   CarClassRelSpeed: 0
+   CarClassMaxFuelPct: 1.000 %
+   CarClassColor: 0xFFDA59
+   CarClassEstLapTime: 95.1234
+   IRating: 1367
+   LicLevel: 12
+   LicString: A 4.99
+   LicColor: 0x0153db
+   CarDesignStr: 0,ff0000,00ff00,0000ff
+   CarSponsorStr: ,0,0
+   ClubName:
+   DivisionName: Division 3
+   CurDriverIncidentCount: 0
+
+SplitTimeInfo:
+ Sectors:
+ - SectorNum: 0
+   SectorStartPct: 0.000000
+ - SectorNum: 1
+   SectorStartPct: 0.333000
+ - SectorNum: 2
+   SectorStartPct: 0.667000
+
+...
+'''
+
+SECTIONS = ('WeekendInfo', 'SessionInfo', 'DriverInfo', 'SplitTimeInfo')
+
+# single values both paths have to agree on, including the types
+SCALARS = (
+    'yes', 'no', 'Yes', 'off', 'On', 'true', 'False', 'null', '~',
+    '0', '-1', '+7', '1350', '0x0153db', '0xFFFFFF',
+    '0.000000', '-1.0000', '95.1234', '.5', '1.5e+3',
+    '2024.04.05.01', '1.2.3', '6.93 km', '55 %', '1:00 pm', '2024-05-14',
+    '0,ff0000,00ff00,0000ff', ',12,44', '"0"', '"007"', '""',
+    'C 3.49', "Driver O'Name", 'a-b', '-x', '0o17', '',
+)
+
+# things only PyYAML knows how to read, fast path has to give up on them
+FALLBACK_SCALARS = ('1_000', '017', '1:30', '.inf', '.NaN', '"a\\"b"', "'single'", 'a: b', '[1, 2]', '{a: 1}', '&anchor x', '*alias', '-', 'x #y')
+
+
+def section_src(key):
+    start = SESSION_INFO.index('\n%s:\n' % key) + 1
+    return SESSION_INFO[start:SESSION_INFO.index('\n\n', start)]
+
+
+def assert_same(fast, slow, path='root'):
+    assert type(fast) is type(slow), '%s: %r is %s, PyYAML gives %r (%s)' % (path, fast, type(fast).__name__, slow, type(slow).__name__)
+    if isinstance(slow, dict):
+        assert list(fast) == list(slow), path
+        for key in slow:
+            assert_same(fast[key], slow[key], '%s.%s' % (path, key))
+    elif isinstance(slow, list):
+        assert len(fast) == len(slow), path
+        for i, (fast_item, slow_item) in enumerate(zip(fast, slow)):
+            assert_same(fast_item, slow_item, '%s[%d]' % (path, i))
+    else:
+        assert fast == slow, path
+
+
+@pytest.mark.parametrize('key', SECTIONS)
+def test_sections_match_pyyaml(irsdk, key):
+    yaml_src = section_src(key)
+    assert_same(irsdk.parse_session_info(yaml_src, key), irsdk.load_session_info_yaml(yaml_src, key)[key])
+
+
+@pytest.mark.parametrize('key', SECTIONS)
+def test_synthetic_sections_match_pyyaml(irsdk_synth, irsdk, key):
+    session_info = irsdk_synth.synthetic_session_info(8, 3).decode(irsdk.YAML_CODE_PAGE)
+    start = session_info.index('\n%s:\n' % key) + 1
+    yaml_src = session_info[start:session_info.index('\n\n', start)]
+    assert_same(irsdk.parse_session_info(yaml_src, key), irsdk.load_session_info_yaml(yaml_src, key)[key])
+
+
+@pytest.mark.parametrize('value', SCALARS)
+def test_scalars_match_pyyaml(irsdk, value):
+    yaml_src = 'WeekendInfo:\n Value: %s\n' % value
+    assert_same(irsdk.parse_session_info(yaml_src, 'WeekendInfo'), irsdk.load_session_info_yaml(yaml_src, 'WeekendInfo')['WeekendInfo'])
+
+
+@pytest.mark.parametrize('key', ('UserName', 'TeamName', 'AbbrevName', 'Initials', 'DriverSetupName'))
+@pytest.mark.parametrize('value', ('yes', '0x10', '12', 'O\'Name "Q" \\ x', ',lead', '- dash', 'a: b', ''))
+def test_driver_names_stay_text(irsdk, key, value):
+    yaml_src = 'DriverInfo:\n %s: %s\n' % (key, value)
+    fast = irsdk.parse_session_info(yaml_src, 'DriverInfo')
+    assert_same(fast, irsdk.load_session_info_yaml(yaml_src, 'DriverInfo')['DriverInfo'])
+    assert fast[key] == value
+
+
+@pytest.mark.parametrize('value', FALLBACK_SCALARS)
+def test_unknown_scalars_fall_back(irsdk, value):
+    with pytest.raises(ValueError):
+        irsdk.parse_session_info('WeekendInfo:\n Value: %s\n' % value, 'WeekendInfo')
+
+
+def test_unknown_layout_falls_back(irsdk):
+    with pytest.raises(ValueError):
+        irsdk.parse_session_info('WeekendInfo:\n\tTrackID: 1\n', 'WeekendInfo')
+    with pytest.raises(ValueError):
+        irsdk.parse_session_info('WeekendInfo:\n TrackID: 1\n  Nested: 2\n', 'WeekendInfo')
+    with pytest.raises(ValueError):
+        irsdk.parse_session_info('WeekendInfo:\n TrackID: [1, 2]\n', 'WeekendInfo')
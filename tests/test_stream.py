@@ -0,0 +1,29 @@
+import asyncio
+import threading
+
+
+def test_subscriber_rate_is_capped(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=120, cars=20, session_info_interval=0)
+    synth.step()
+    ir = irsdk.IRSDK()
+    assert ir.startup(test_file=mem_file)
+    sim = threading.Thread(target=synth.run, args=(1.0,))
+    sim.start()
+
+    async def receive(hz, count):
+        ticks = []
+        async for frame in ir.frames(['RPM'], hz):
+            ticks.append(frame.tick_count)
+            if len(ticks) == count:
+                break
+        return ticks
+
+    try:
+        ticks = asyncio.run(receive(10, 6))
+    finally:
+        sim.join()
+        ir.shutdown()
+    # 12 sim ticks per frame at 10 Hz, first frame included, with some slack for scheduling
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert min(gaps) >= 9, ticks
@@ -0,0 +1,98 @@
+import struct
+import tracemalloc
+
+
+def test_freeze_does_not_allocate_per_frame(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    ir = irsdk.IRSDK()
+    assert ir.startup(test_file=mem_file)
+    try:
+        # decoders, tracker and frozen copies are built on first use
+        for _ in range(10):
+            synth.step()
+            ir.freeze_var_buffer_latest()
+            ir['RPM']
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for _ in range(10000):
+                synth.step()
+                assert ir.freeze_var_buffer_latest()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        sdk_only = [tracemalloc.Filter(True, irsdk.__file__)]
+        growth = sum(stat.size_diff for stat in after.filter_traces(sdk_only).compare_to(before.filter_traces(sdk_only), 'lineno'))
+        assert growth < 1024, '%d bytes kept by SDK over 10000 frames' % growth
+    finally:
+        ir.shutdown()
+        synth.close()
+
+
+def swap_var_offsets(irsdk, mem, a, b):
+    # point var headers a and b at each other's data, as if the sim rewrote the var header block
+    num_vars, var_header_offset = struct.unpack_from('=2i', mem, 24)
+    var_headers = irsdk.VarHeader.parse_table(mem, var_header_offset, num_vars)
+    records = {var_header.name: var_header_offset + i * irsdk.VarHeader._struct.size for i, var_header in enumerate(var_headers)}
+    offset_a, = struct.unpack_from('=i', mem, records[a] + 4)
+    offset_b, = struct.unpack_from('=i', mem, records[b] + 4)
+    struct.pack_into('=i', mem, records[a] + 4, offset_b)
+    struct.pack_into('=i', mem, records[b] + 4, offset_a)
+
+
+def test_startup_again_sees_rewritten_var_headers(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    ir = irsdk.IRSDK()
+    try:
+        synth.step()
+        assert ir.startup(test_file=mem_file)
+        ir.freeze_var_buffer_latest()
+        rpm, speed = ir['RPM'], ir['Speed']
+        assert rpm != speed
+
+        swap_var_offsets(irsdk, synth._mem, 'RPM', 'Speed')
+        assert ir.startup(test_file=mem_file)
+        ir.freeze_var_buffer_latest()
+        assert (ir['RPM'], ir['Speed']) == (speed, rpm)
+    finally:
+        ir.shutdown()
+        synth.close()
+
+
+def test_freeze_sees_rewritten_var_headers_after_session_info_update(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    ir = irsdk.IRSDK()
+    try:
+        synth.step()
+        assert ir.startup(test_file=mem_file)
+        ir.freeze_var_buffer_latest()
+        rpm, speed = ir['RPM'], ir['Speed']
+
+        swap_var_offsets(irsdk, synth._mem, 'RPM', 'Speed')
+        synth.update_session_info()
+        ir.freeze_var_buffer_latest()
+        assert (ir['RPM'], ir['Speed']) == (speed, rpm)
+    finally:
+        ir.shutdown()
+        synth.close()
+
+
+def test_snapshot_with_repeated_names(irsdk, irsdk_synth, tmp_path):
+    mem_file = str(tmp_path / 'synth.bin')
+    synth = irsdk_synth.IRSDKSynth(mem_file, tick_rate=60, cars=20, session_info_interval=0)
+    ir = irsdk.IRSDK()
+    try:
+        synth.step()
+        assert ir.startup(test_file=mem_file)
+        ir.freeze_var_buffer_latest()
+        snapshot = ir.snapshot(['RPM', 'Gear', 'RPM', 'Nope', 'Nope'])
+        assert snapshot._fields == ('RPM', 'Gear', 'Nope')
+        assert snapshot == (ir['RPM'], ir['Gear'], None)
+    finally:
+        ir.shutdown()
+        synth.close()